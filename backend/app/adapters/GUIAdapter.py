@@ -3,15 +3,26 @@ backend/app/adapters/GUIAdapter.py
 ------------------------------------
 GUI Adapter - Interface adapter for GUI operations
 """
+import re
+import stat
 from typing import Dict, Any, List, Optional, Callable
 from pathlib import Path
-import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # fall back to the standard library json
+    orjson = None
+    import json
+
 from ..interfaces.IMonitorService import IMonitorService
 from ..interfaces.IChannelConfigurationService import IChannelConfigurationService
 from ..interfaces.IFileProvider import IFileProvider
 from ..entities.AlarmEvent import AlarmEvent
+from ..infra.datastore.AtomicFile import atomic_write_bytes
+
+# Workstation number in data file names such as "MPL3.dat" / "mpl12_run.dat"
+_MPL_RE = re.compile(r'mpl(\d+)', re.IGNORECASE)
 
 
 class GUIAdapter:
@@ -59,11 +70,15 @@ class GUIAdapter:
             True if saved successfully
         """
         try:
-            with open(self.label_selection_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'timestamp': datetime.now().isoformat(),
-                    'labels': selected_labels
-                }, f, ensure_ascii=False, indent=2)
+            payload = {
+                'timestamp': datetime.now().isoformat(),
+                'labels': selected_labels
+            }
+            if orjson is not None:
+                data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+            atomic_write_bytes(self.label_selection_path, data)
             return True
         except Exception:
             return False
@@ -81,9 +96,10 @@ class GUIAdapter:
             if not self.label_selection_path.exists():
                 return None
             
-            with open(self.label_selection_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('labels', {})
+            with open(self.label_selection_path, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            return data.get('labels', {})
         except Exception:
             return None
     
@@ -228,13 +244,16 @@ class GUIAdapter:
         """
         path = Path(file_path)
         
-        if not path.exists():
+        # One stat() answers both "exists" and "is a regular file"
+        try:
+            st = path.stat()
+        except OSError:
             return {
                 'valid': False,
                 'error': 'File does not exist'
             }
         
-        if not path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             return {
                 'valid': False,
                 'error': 'Path is not a file'
@@ -266,12 +285,10 @@ class GUIAdapter:
             Inferred workstation ID or None
         """
         try:
-            import re
-            path = Path(file_path)
-            stem = path.stem
+            stem = Path(file_path).stem
             
-            if stem.startswith('mpl') or stem.startswith('MPL'):
-                match = re.search(r'mpl(\d+)', stem.lower())
+            if stem.startswith(('mpl', 'MPL')):
+                match = _MPL_RE.search(stem)
                 if match:
                     return match.group(1)
         except Exception:
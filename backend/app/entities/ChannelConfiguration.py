@@ -6,7 +6,7 @@ Channel配置系统实体 - 支持分层配置和用户自定义映射
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 from enum import Enum
 from datetime import datetime
 
@@ -42,7 +42,7 @@ class ChannelDefinition:
     """
     channel_id: str                          # 原始channel ID，如 "T1"
     category: ChannelCategory                # 所属大类
-    available_subtypes: List[ChannelSubtype] # 可选的细分类型
+    available_subtypes: Tuple[ChannelSubtype, ...] # 可选的细分类型（同一大类的channel共享）
     default_subtype_id: str                  # 默认细分类型ID
     is_monitorable: bool = True              # 是否可监控
     system_description: str = ""             # 系统层面的描述
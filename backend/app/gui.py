@@ -9,15 +9,36 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import queue
+import time
+import concurrent.futures
+import functools
 import logging
+import logging.handlers
 from pathlib import Path
 from datetime import datetime
+from collections import deque
 from typing import Optional, Dict, Any
-import json
 
 from .adapters.GUIAdapter import GUIAdapter
 from .di.config import get_monitor_service, get_channel_service, create_file_provider
 from .entities.AlarmEvent import AlarmEvent
+from .infra.datastore.OffsetStore import OffsetStore, OFFSET_FILE
+
+logger = logging.getLogger(__name__)
+
+LOG_QUEUE_MAXSIZE = 10000
+LOG_TEXT_MAX_LINES = 10000  # lines kept in the log viewer
+LABEL_BUILD_CHUNK = 32  # label tree rows inserted per idle callback
+ALARM_FLUSH_MS = 33  # alarm table refresh interval (~30 updates/sec)
+MESSAGE_DRAIN_CAP = 200  # max queued messages handled per process_messages tick
+
+# Alarm table icon per severity value
+_SEVERITY_ICONS = {
+    "low": "🔵",
+    "medium": "🟡",
+    "high": "🔴",
+    "critical": "💀"
+}
 
 
 class SmartMonitorGUI:
@@ -41,17 +62,46 @@ class SmartMonitorGUI:
         self.monitoring_thread: Optional[threading.Thread] = None
         
         # Session statistics
-        self.session_start_time: Optional[datetime] = None
+        self.session_start_time: Optional[datetime] = None  # wall clock, for display
+        self._session_mono_start: Optional[float] = None  # time.monotonic(), for elapsed time
         self.session_total_records = 0
         self.session_total_alarms = 0
         
         # Label matching related
         self.channel_labels = {}
+        self._label_tree_items: Dict[str, tuple] = {}  # tree item -> (channel ID, subtype ID, label)
+        self._label_tree_chosen: Dict[str, str] = {}  # channel ID -> marked tree item
+        self._pending_label_build = None  # row generator of an in-progress tree build
+        
+        # Serialises temp file cleanups started from stop_monitoring
+        self._cleanup_lock = threading.Lock()
+        
+        # Widgets created later by create_widgets/create_page2 (None until built)
+        self.workstation_id_var: Optional[tk.StringVar] = None
+        self.alarm_tree: Optional[ttk.Treeview] = None
+        self.page2_frame: Optional[ttk.Frame] = None
+        self.log_text: Optional[scrolledtext.ScrolledText] = None
+        # Log lines received before the log viewer exists
+        self._log_backlog = deque(maxlen=LOG_QUEUE_MAXSIZE)
+        
+        # Alarms waiting to be added to the table (appended from worker threads)
+        self._pending_alarms = deque()
+        self._alarm_flush_scheduled = False
+        
+        # Last values written by update_status, to skip unchanged StringVar sets
+        self._last_stats = {'records': None, 'alarms': None, 'time': None, 'speed': None, 'status': None}
         self.label_mode = False
         self.config = {'categories': {}}  # Initialize with empty config
         
-        # Message queue for inter-thread communication
-        self.message_queue = queue.Queue()
+        # Worker for blocking loads (label configuration) kept off the Tk loop;
+        # a single worker, since ChannelConfigurationService is not thread-safe
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Bumped on every label choice change; loads finishing with an older value are dropped
+        self._cfg_generation = 0
+        
+        # Message queue for inter-thread communication (bounded so a stalled
+        # GUI cannot grow it without limit; LogHandler drops on overflow)
+        self.message_queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
         
         # Set up logging
         self.setup_logging()
@@ -67,10 +117,17 @@ class SmartMonitorGUI:
     
     def setup_logging(self):
         """Set up logging"""
-        # Create log handler
-        self.log_handler = LogHandler(self.message_queue)
+        # Logging threads only enqueue the record; a QueueListener thread
+        # formats it and hands it to the GUI message queue
+        self.log_queue = queue.Queue(-1)
+        self.log_handler = logging.handlers.QueueHandler(self.log_queue)
+        self.log_listener = logging.handlers.QueueListener(self.log_queue, LogHandler(self.message_queue))
         logging.getLogger().addHandler(self.log_handler)
         logging.getLogger().setLevel(logging.INFO)
+        self.log_listener.start()
+        
+        # Drain pending log records before the window goes away
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def create_widgets(self):
         """Create interface components"""
@@ -84,12 +141,10 @@ class SmartMonitorGUI:
         self.main_frame.columnconfigure(1, weight=1)
         self.main_frame.rowconfigure(2, weight=1)
         
-        # Create first page (file selection and label matching)
+        # Create first page (file selection and label matching);
+        # the second page is built on first navigation (show_page2)
         self.create_page1()
         
-        # Create second page (control panel and monitoring status)
-        self.create_page2()
-        
         # Default to show first page
         self.show_page1()
     
@@ -110,37 +165,34 @@ class SmartMonitorGUI:
         self.confirm_button = ttk.Button(button_frame, text="✅ Confirm and Enter Monitoring", 
                                         command=self.confirm_and_go_to_page2)
         self.confirm_button.grid(row=0, column=0)
+        
+        # Initial label choice state (may disable Confirm while the configuration loads)
+        self.on_label_choice_change()
     
     def create_file_selector_page1(self):
         """Create file selector for first page"""
         file_frame = ttk.LabelFrame(self.page1_frame, text="📁 File Selection", padding="10")
         file_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        # Data file selection
-        ttk.Label(file_frame, text="Data File:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
-        self.dat_file_var = tk.StringVar()
-        self.dat_file_entry = ttk.Entry(file_frame, textvariable=self.dat_file_var, width=50)
-        self.dat_file_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 5))
-        ttk.Button(file_frame, text="Browse", command=self.browse_dat_file).grid(row=0, column=2)
-        
-        # Config file selection
-        ttk.Label(file_frame, text="Config File:").grid(row=1, column=0, sticky=tk.W, padx=(0, 5), pady=(10, 0))
-        self.config_file_var = tk.StringVar(value="config/rules.yaml")
-        self.config_file_entry = ttk.Entry(file_frame, textvariable=self.config_file_var, width=50)
-        self.config_file_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(0, 5), pady=(10, 0))
-        ttk.Button(file_frame, text="Browse", command=self.browse_config_file).grid(row=1, column=2, pady=(10, 0))
-        
-        # Run ID
-        ttk.Label(file_frame, text="Run ID:").grid(row=2, column=0, sticky=tk.W, padx=(0, 5), pady=(10, 0))
-        self.run_id_var = tk.StringVar()
-        self.run_id_entry = ttk.Entry(file_frame, textvariable=self.run_id_var, width=50)
-        self.run_id_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(0, 5), pady=(10, 0))
-        
-        # Workstation ID
-        ttk.Label(file_frame, text="Workstation ID:").grid(row=3, column=0, sticky=tk.W, padx=(0, 5), pady=(10, 0))
-        self.workstation_id_var = tk.StringVar()
-        self.workstation_id_entry = ttk.Entry(file_frame, textvariable=self.workstation_id_var, width=50)
-        self.workstation_id_entry.grid(row=3, column=1, sticky=(tk.W, tk.E), padx=(0, 5), pady=(10, 0))
+        # One row per field: (label, attribute prefix, default value, browse command)
+        rows = [
+            ("Data File:", "dat_file", "", self.browse_dat_file),
+            ("Config File:", "config_file", "config/rules.yaml", self.browse_config_file),
+            ("Run ID:", "run_id", "", None),
+            ("Workstation ID:", "workstation_id", "", None),
+        ]
+        for row, (text, name, default, command) in enumerate(rows):
+            pady = (10, 0) if row else 0
+            ttk.Label(file_frame, text=text).grid(row=row, column=0, sticky=tk.W, padx=(0, 5), pady=pady)
+            
+            var = tk.StringVar(value=default)
+            entry = ttk.Entry(file_frame, textvariable=var, width=50)
+            entry.grid(row=row, column=1, sticky=(tk.W, tk.E), padx=(0, 5), pady=pady)
+            setattr(self, f"{name}_var", var)
+            setattr(self, f"{name}_entry", entry)
+            
+            if command is not None:
+                ttk.Button(file_frame, text="Browse", command=command).grid(row=row, column=2, pady=pady)
         
         # Configure grid weights
         file_frame.columnconfigure(1, weight=1)
@@ -169,36 +221,30 @@ class SmartMonitorGUI:
         self.label_selection_frame = ttk.Frame(label_frame)
         self.label_selection_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # Create scrollable area for label selection
-        self.label_canvas = tk.Canvas(self.label_selection_frame, height=300)
-        self.label_scrollbar = ttk.Scrollbar(self.label_selection_frame, orient="vertical", command=self.label_canvas.yview)
-        self.label_scrollable_frame = ttk.Frame(self.label_canvas)
-        
-        self.label_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.label_canvas.configure(scrollregion=self.label_canvas.bbox("all"))
-        )
-        
-        self.label_canvas.create_window((0, 0), window=self.label_scrollable_frame, anchor="nw")
-        self.label_canvas.configure(yscrollcommand=self.label_scrollbar.set)
-        
-        # Add mouse wheel support
-        def _on_mousewheel(event):
-            self.label_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        # Category -> channel -> subtype tree (one widget for all rows)
+        self.label_tree = ttk.Treeview(self.label_selection_frame, columns=("tag", "default"),
+                                       show="tree headings", height=12)
+        self.label_tree.heading("#0", text="Label")
+        self.label_tree.heading("tag", text="Tag")
+        self.label_tree.heading("default", text="Default")
+        self.label_tree.column("default", width=80)
+        self.label_tree.bind("<<TreeviewSelect>>", self.on_label_tree_select)
         
-        self.label_canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        self.label_scrollbar = ttk.Scrollbar(self.label_selection_frame, orient="vertical", command=self.label_tree.yview)
+        self.label_tree.configure(yscrollcommand=self.label_scrollbar.set)
         
-        self.label_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.label_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         self.label_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        # Status line below the tree
+        self.label_status_var = tk.StringVar()
+        ttk.Label(self.label_selection_frame, textvariable=self.label_status_var).grid(row=1, column=0, sticky=tk.W)
+        
         # Configure grid weights
         label_frame.columnconfigure(0, weight=1)
         label_frame.rowconfigure(2, weight=1)
         self.label_selection_frame.columnconfigure(0, weight=1)
         self.label_selection_frame.rowconfigure(0, weight=1)
-        
-        # Initial state
-        self.on_label_choice_change()
     
     def create_page2(self):
         """Create second page: control panel and monitoring status"""
@@ -227,11 +273,14 @@ class SmartMonitorGUI:
     
     def show_page1(self):
         """Show first page"""
-        self.page2_frame.grid_remove()
+        if self.page2_frame is not None:
+            self.page2_frame.grid_remove()
         self.page1_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
     
     def show_page2(self):
         """Show second page"""
+        if self.page2_frame is None:
+            self.create_page2()
         self.page1_frame.grid_remove()
         self.page2_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
     
@@ -239,15 +288,26 @@ class SmartMonitorGUI:
         """When label selection changes"""
         choice = self.label_choice_var.get()
         
-        # Clear label selection area
-        for widget in self.label_scrollable_frame.winfo_children():
-            widget.destroy()
+        # Invalidate configuration loads still running for an earlier choice
+        self._cfg_generation += 1
+        
+        # Clear label selection area (and stop any in-progress build)
+        self._pending_label_build = None
+        self.label_tree.delete(*self.label_tree.get_children())
+        self._label_tree_items = {}
+        self._label_tree_chosen = {}
+        self.channel_labels = {}
+        self.label_status_var.set("")
+        self.confirm_button.config(state='normal')
         
         if choice == "1":
-            # Re-select labels
+            # Re-select labels; Confirm stays disabled until this load is applied,
+            # otherwise it would save stale or empty selections
             self.label_mode = True
-            self.config = self.adapter.load_label_configuration()
-            self.create_label_selection_ui()
+            self.label_status_var.set("⏳ Loading label configuration...")
+            self.confirm_button.config(state='disabled')
+            fut = self._executor.submit(self._load_cfg_sync)
+            fut.add_done_callback(functools.partial(self._on_cfg_loaded, self._cfg_generation))
         elif choice == "2":
             # Load previous label selection record
             self.label_mode = True
@@ -255,39 +315,98 @@ class SmartMonitorGUI:
         else:
             # Skip label matching
             self.label_mode = False
-            self.channel_labels = {}
-            ttk.Label(self.label_scrollable_frame, text="✅ Will use raw channel ID").grid(row=0, column=0, sticky=tk.W)
+            self.label_status_var.set("✅ Will use raw channel ID")
+    
+    def _load_cfg_sync(self) -> Dict[str, Any]:
+        """Load label configuration (runs in the worker thread)"""
+        return self.adapter.load_label_configuration()
+    
+    def _on_cfg_loaded(self, generation: int, fut: concurrent.futures.Future):
+        """Post the loaded configuration back to the main loop, tagged with its generation"""
+        try:
+            self.message_queue.put(("cfg_loaded", (generation, fut.result())))
+        except Exception as e:
+            self.message_queue.put(("cfg_failed", (generation, e)))
+    
+    def _apply_loaded_config(self, generation: int, config: Dict[str, Any]):
+        """Build the label UI from a configuration loaded in the background"""
+        # The user changed the label choice while loading (even 1 -> 3 -> 1)
+        if generation != self._cfg_generation:
+            return
+        self.label_status_var.set("")
+        self.config = config
+        self.create_label_selection_ui()
+        self.confirm_button.config(state='normal')
     
     def create_label_selection_ui(self):
-        """Create label selection interface"""
-        row = 0
+        """Create label selection interface, a chunk of rows per idle callback"""
+        # Start from an empty tree so a rebuild never leaves rows of an earlier one
+        self.label_tree.delete(*self.label_tree.get_children())
+        self._label_tree_items = {}
+        self._label_tree_chosen = {}
+        self.channel_labels = {}
+        
+        rows = self._iter_label_rows()
+        self._pending_label_build = rows
+        self.root.after_idle(self._build_label_chunk, rows)
+    
+    def _build_label_chunk(self, rows):
+        """Insert the next LABEL_BUILD_CHUNK rows and reschedule if work remains"""
+        if rows is not self._pending_label_build:
+            return  # cancelled by a label choice change or superseded by a newer build
+        
+        for _ in range(LABEL_BUILD_CHUNK):
+            if next(rows, None) is None:
+                self._pending_label_build = None
+                return
+        self.root.after_idle(self._build_label_chunk, rows)
+    
+    def _iter_label_rows(self):
+        """Insert label tree rows one per step"""
+        tree = self.label_tree
         for category_key, category in self.config['categories'].items():
             # Category title - use English name
             category_name = category['category_name'].get('en', category['category_name']) if isinstance(category['category_name'], dict) else category['category_name']
             category_desc = category['category_description'].get('en', category['category_description']) if isinstance(category['category_description'], dict) else category['category_description']
-            ttk.Label(self.label_scrollable_frame, text=f"【{category_name}】{category_desc}", 
-                      font=('Arial', 10, 'bold')).grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
-            row += 1
+            category_item = tree.insert("", "end", text=f"【{category_name}】{category_desc}", open=True)
+            yield category_item
             
             for ch in category['channels']:
                 ch_id = ch['channel_id']
+                default_id = ch.get('default_subtype_id', '')
                 
-                # Channel title
-                ttk.Label(self.label_scrollable_frame, text=f"  Channel: {ch_id}", 
-                          font=('Arial', 9, 'bold')).grid(row=row, column=0, sticky=tk.W, padx=(20, 0))
-                row += 1
+                # Channel node
+                channel_item = tree.insert(category_item, "end", text=f"Channel: {ch_id}")
                 
-                # Create radio button
-                label_var = tk.StringVar(value=ch.get('default_subtype_id', ''))
+                # Selected subtype, defaults to the channel default
+                label_var = tk.StringVar(value=default_id)
                 self.channel_labels[ch_id] = label_var
+                yield channel_item
                 
                 for st in ch['available_subtypes']:
-                    default_mark = " (Default)" if st['subtype_id'] == ch.get('default_subtype_id', '') else ""
-                    ttk.Radiobutton(self.label_scrollable_frame, text=st['label'], 
-                                   variable=label_var, value=st['subtype_id']).grid(row=row, column=0, sticky=tk.W, padx=(40, 0))
-                    row += 1
-                
-                row += 1  # Add empty line
+                    chosen = st['subtype_id'] == default_id
+                    default_mark = "(Default)" if chosen else ""
+                    item = tree.insert(channel_item, "end", text=f"{'●' if chosen else '○'} {st['label']}",
+                                       values=(st['tag'], default_mark))
+                    self._label_tree_items[item] = (ch_id, st['subtype_id'], st['label'])
+                    if chosen:
+                        self._label_tree_chosen[ch_id] = item
+                    yield item
+    
+    def on_label_tree_select(self, event=None):
+        """Mark the selected subtype as the label of its channel"""
+        for item in self.label_tree.selection():
+            entry = self._label_tree_items.get(item)
+            if entry is None:
+                continue  # category or channel node
+            
+            ch_id, subtype_id, label = entry
+            previous = self._label_tree_chosen.get(ch_id)
+            if previous is not None and previous != item:
+                self.label_tree.item(previous, text=f"○ {self._label_tree_items[previous][2]}")
+            self.label_tree.item(item, text=f"● {label}")
+            self._label_tree_chosen[ch_id] = item
+            self.channel_labels[ch_id].set(subtype_id)
     
     def load_last_label_selection(self):
         """Load previous label selection record"""
@@ -305,7 +424,7 @@ class SmartMonitorGUI:
                 if ch_id in self.channel_labels:
                     self.channel_labels[ch_id].set(label)
             
-            ttk.Label(self.label_scrollable_frame, text="✅ Loaded previous label selection record (Time: Unknown)").grid(row=0, column=0, sticky=tk.W)
+            self.label_status_var.set("✅ Loaded previous label selection record (Time: Unknown)")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load label selection record: {str(e)}")
@@ -342,6 +461,13 @@ class SmartMonitorGUI:
         
         # Save label selection (if label matching is selected)
         if self.label_mode and self.label_choice_var.get() == "1":
+            # Finish a tree build still running in idle chunks so every channel is collected
+            rows = self._pending_label_build
+            if rows is not None:
+                self._pending_label_build = None
+                for _ in rows:
+                    pass
+            
             try:
                 # Collect label selection
                 selected_labels = {}
@@ -474,8 +600,8 @@ class SmartMonitorGUI:
             workstation_id = self.adapter.auto_infer_workstation_id(filename)
             if workstation_id:
                 self.workstation_id_var.set(workstation_id)
-                path = Path(filename)
-                print(f"Auto inferred workstation ID: {workstation_id} (from filename: {path.stem})")
+                logger.info("Auto inferred workstation ID: %s (from filename: %s)",
+                            workstation_id, Path(filename).stem)
     
     def browse_config_file(self):
         """Browse config file"""
@@ -515,11 +641,12 @@ class SmartMonitorGUI:
         # Update interface status
         self.start_button.config(state='disabled')
         self.stop_button.config(state='normal')
-        self.status_text.set("Processing...")
+        self._set_stat('status', self.status_text, "Processing...")
         self.progress_var.set(0)
         
         # Record session start time
         self.session_start_time = datetime.now()
+        self._session_mono_start = time.monotonic()
         self.session_total_records = 0
         self.session_total_alarms = 0
         
@@ -536,15 +663,23 @@ class SmartMonitorGUI:
         # Stop monitoring through adapter
         self.adapter.stop_monitoring()
         
+        # Remove the simulation temp file off the GUI thread; the Tk variable
+        # is read here because Tk must only be touched from the main thread
+        if self.file_provider is not None:
+            self.file_provider = None
+            workstation_id = self.workstation_id_var.get().strip() or "1"
+            threading.Thread(target=self._cleanup_temp_files, args=(workstation_id,), daemon=True).start()
+        
         # Reset session statistics
         self.session_start_time = None
+        self._session_mono_start = None
         self.session_total_records = 0
         self.session_total_alarms = 0
         
         # Update interface status
         self.start_button.config(state='normal')
         self.stop_button.config(state='disabled')
-        self.status_text.set("Stopped")
+        self._set_stat('status', self.status_text, "Stopped")
         self.progress_var.set(0)
     
     def clear_results(self):
@@ -554,10 +689,10 @@ class SmartMonitorGUI:
             self.alarm_tree.delete(item)
         
         # Reset statistics
-        self.records_var.set("0")
-        self.alarms_var.set("0")
-        self.time_var.set("0.00s")
-        self.speed_var.set("0 records/sec")
+        self._set_stat('records', self.records_var, "0")
+        self._set_stat('alarms', self.alarms_var, "0")
+        self._set_stat('time', self.time_var, "0.00s")
+        self._set_stat('speed', self.speed_var, "0 records/sec")
         
         # Clear log
         self.log_text.delete(1.0, tk.END)
@@ -593,21 +728,25 @@ class SmartMonitorGUI:
             result = self.adapter.start_simulation(dat_file, config_file, run_id, workstation_id, self.file_provider)
             
             if result['success']:
+                # Record session start time
+                self.session_start_time = datetime.now()
+                self._session_mono_start = time.monotonic()
+                
                 # Update interface status
                 self.start_button.config(state='disabled')
                 self.stop_button.config(state='normal')
-                self.status_text.set("Simulation monitoring running...")
+                self._set_stat('status', self.status_text, "Simulation monitoring running...")
                 self.progress_var.set(0)
                 
                 # Show success message
                 messagebox.showinfo("Success", f"Simulation started!\nWorkstation ID: {workstation_id}\nPush one record every 10 seconds")
             else:
                 messagebox.showerror("Error", result['error'])
-                self.status_text.set("Simulation failed")
+                self._set_stat('status', self.status_text, "Simulation failed")
         
         except Exception as e:
             messagebox.showerror("Error", f"Simulation failed: {str(e)}")
-            self.status_text.set(f"Simulation failed: {str(e)}")
+            self._set_stat('status', self.status_text, f"Simulation failed: {str(e)}")
     
     def _monitoring_worker(self, dat_file: str, config_file: str, run_id: str):
         """Monitoring worker thread"""
@@ -621,18 +760,18 @@ class SmartMonitorGUI:
                 self.session_total_alarms = result['alarms_count']
                 
                 # Calculate processing time and speed
-                if self.session_start_time:
-                    processing_time = (datetime.now() - self.session_start_time).total_seconds()
+                if self._session_mono_start is not None:
+                    processing_time = time.monotonic() - self._session_mono_start
                     speed = self.session_total_records / processing_time if processing_time > 0 else 0
                     
                     # Update statistics
-                    self.records_var.set(str(self.session_total_records))
-                    self.alarms_var.set(str(self.session_total_alarms))
-                    self.time_var.set(f"{processing_time:.2f}s")
-                    self.speed_var.set(f"{speed:.2f} records/sec")
+                    self._set_stat('records', self.records_var, str(self.session_total_records))
+                    self._set_stat('alarms', self.alarms_var, str(self.session_total_alarms))
+                    self._set_stat('time', self.time_var, f"{processing_time:.2f}s")
+                    self._set_stat('speed', self.speed_var, f"{speed:.2f} records/sec")
                 
                 # Update status
-                self.status_text.set("Processing complete")
+                self._set_stat('status', self.status_text, "Processing complete")
                 self.progress_var.set(100)
                 
                 # Display completion message
@@ -649,25 +788,30 @@ class SmartMonitorGUI:
     
     def _gui_alarm_handler(self, alarm: AlarmEvent):
         """GUI alarm handler"""
-        # Add alarm to table in GUI thread
-        self.root.after(0, self._add_alarm_to_table, alarm)
+        # Queue the alarm; the GUI thread adds queued alarms in batches
+        self._pending_alarms.append(alarm)
+        if not self._alarm_flush_scheduled:
+            self._alarm_flush_scheduled = True
+            self.root.after(ALARM_FLUSH_MS, self._flush_alarms)
+    
+    def _flush_alarms(self):
+        """Add all queued alarms to the table in one pass"""
+        # Clear the flag first so alarms queued during the drain schedule a new flush
+        self._alarm_flush_scheduled = False
+        
+        pending = self._pending_alarms
+        while pending:
+            self._add_alarm_to_table(pending.popleft())
     
     def _add_alarm_to_table(self, alarm: AlarmEvent):
         """Add alarm to table"""
-        severity_icons = {
-            "low": "🔵",
-            "medium": "🟡", 
-            "high": "🔴",
-            "critical": "💀"
-        }
-        
-        icon = severity_icons.get(alarm.severity.value.lower(), "⚪")
-        severity_display = f"{icon} {alarm.severity.value.upper()}"
+        severity = alarm.severity.value
+        icon = _SEVERITY_ICONS.get(severity, "⚪")
+        severity_display = f"{icon} {severity.upper()}"
         
         # Truncate sensor value display
-        sensor_values_str = str(alarm.sensor_values)[:50]
-        if len(str(alarm.sensor_values)) > 50:
-            sensor_values_str += "..."
+        sv = str(alarm.sensor_values)
+        sensor_values_str = sv[:50] + "..." if len(sv) > 50 else sv
         
         self.alarm_tree.insert("", "end", values=(
             alarm.timestamp.strftime("%H:%M:%S"),
@@ -678,22 +822,45 @@ class SmartMonitorGUI:
         ))
     
     def process_messages(self):
-        """Process log messages"""
-        try:
-            while True:
-                msg = self.message_queue.get_nowait()
-                self.log_text.insert(tk.END, msg + "\n")
-                self.log_text.see(tk.END)
-        except queue.Empty:
-            pass
-        
-        # Check for messages every 100ms
-        self.root.after(100, self.process_messages)
+        """Process queued messages, appending all pending log lines at once"""
+        lines = []
+        get = self.message_queue.get_nowait
+        for _ in range(MESSAGE_DRAIN_CAP):
+            try:
+                msg = get()
+            except queue.Empty:
+                break
+            
+            if isinstance(msg, tuple):
+                kind, payload = msg
+                if kind == "cfg_loaded":
+                    self._apply_loaded_config(*payload)
+                elif kind == "cfg_failed" and payload[0] == self._cfg_generation:
+                    self.label_status_var.set(f"❌ Failed to load label configuration: {payload[1]}")
+            else:
+                lines.append(msg)
+        
+        if self.log_text is None:
+            # Log viewer not built yet; keep the lines for when it is
+            self._log_backlog.extend(lines)
+        elif lines or self._log_backlog:
+            if self._log_backlog:
+                lines[:0] = self._log_backlog
+                self._log_backlog.clear()
+            # One Text.insert per tick instead of one per line
+            lines.append("")
+            self.log_text.insert(tk.END, "\n".join(lines))
+            # Keep only the newest LOG_TEXT_MAX_LINES lines (no-op while shorter)
+            self.log_text.delete("1.0", f"end-{LOG_TEXT_MAX_LINES}l")
+            self.log_text.see(tk.END)
+        
+        # Check for messages every 50ms
+        self.root.after(50, self.process_messages)
     
     def update_status(self):
         """Update monitoring status"""
         # Get status through adapter
-        status = self.adapter.get_monitoring_status()
+        status = self.adapter.get_monitoring_status() if self.page2_frame is not None else {}
         
         if status.get('is_monitoring'):
             stats = status.get('stats', {})
@@ -703,38 +870,44 @@ class SmartMonitorGUI:
             self.session_total_alarms = stats.get('total_alarms_generated', 0)
             
             # Calculate session runtime and processing speed
-            if self.session_start_time:
-                elapsed_time = (datetime.now() - self.session_start_time).total_seconds()
-                self.time_var.set(f"{elapsed_time:.1f}s")
+            if self._session_mono_start is not None:
+                elapsed_time = time.monotonic() - self._session_mono_start
+                self._set_stat('time', self.time_var, f"{elapsed_time:.1f}s")
                 
                 # Calculate processing speed (records/sec)
                 if elapsed_time > 0:
                     speed = self.session_total_records / elapsed_time
-                    self.speed_var.set(f"{speed:.2f} records/sec")
+                    self._set_stat('speed', self.speed_var, f"{speed:.2f} records/sec")
                 else:
-                    self.speed_var.set("0.00 records/sec")
+                    self._set_stat('speed', self.speed_var, "0.00 records/sec")
             else:
-                self.time_var.set("0.0s")
-                self.speed_var.set("0.00 records/sec")
+                self._set_stat('time', self.time_var, "0.0s")
+                self._set_stat('speed', self.speed_var, "0.00 records/sec")
             
             # Update record count and alarm count
-            self.records_var.set(str(self.session_total_records))
-            self.alarms_var.set(str(self.session_total_alarms))
+            self._set_stat('records', self.records_var, str(self.session_total_records))
+            self._set_stat('alarms', self.alarms_var, str(self.session_total_alarms))
             
             # Update status text
             if status.get('file_provider'):
                 fp_status = status['file_provider']
                 if fp_status.get('total_records_pushed'):
-                    self.status_text.set(f"Simulation running - {fp_status['total_records_pushed']} records pushed")
+                    self._set_stat('status', self.status_text, f"Simulation running - {fp_status['total_records_pushed']} records pushed")
                 else:
-                    self.status_text.set("Simulation monitoring running...")
+                    self._set_stat('status', self.status_text, "Simulation monitoring running...")
         
         # Update status every 1 second
         self.root.after(1000, self.update_status)
     
+    def _set_stat(self, key: str, var: tk.StringVar, value: str):
+        """Set a status StringVar only if its value changed since the last tick"""
+        if self._last_stats[key] != value:
+            self._last_stats[key] = value
+            var.set(value)
+    
     def update_alarm_table_headers(self):
         """Update alarm table column headers"""
-        if hasattr(self, 'alarm_tree'):
+        if self.alarm_tree is not None:
             # Set column headers
             headers = [
                 "Time",
@@ -748,41 +921,42 @@ class SmartMonitorGUI:
                 self.alarm_tree.heading(self.alarm_columns[i], text=header)
                 self.alarm_tree.column(self.alarm_columns[i], width=100)
     
-    def _cleanup_temp_files(self):
-        """Clean up temporary files and offset records"""
+    def _cleanup_temp_files(self, workstation_id: str):
+        """Clean up temporary files and offset records (runs in a worker thread)"""
+        with self._cleanup_lock:
+            self._cleanup_temp_files_locked(workstation_id)
+    
+    def _cleanup_temp_files_locked(self, workstation_id: str):
+        """Delete the workstation's temp file and its offset record"""
         try:
-            import json
-            from pathlib import Path
-            
             # Clean up temp files
-            workstation_id = self.workstation_id_var.get().strip() if hasattr(self, 'workstation_id_var') and self.workstation_id_var.get().strip() else "1"
             temp_file = Path(f"data/mpl{workstation_id}_temp.dat")
-            if temp_file.exists():
+            try:
                 temp_file.unlink()
-                print(f"Deleted temp file: {temp_file}")
+                logger.info("Deleted temp file: %s", temp_file)
+            except FileNotFoundError:
+                pass
             
             # Clean up offset records
-            offset_file = Path(".offsets.json")
-            if offset_file.exists():
+            if OFFSET_FILE.exists():
                 try:
-                    with open(offset_file, 'r', encoding='utf-8') as f:
-                        offsets = json.load(f)
-                    
-                    # Delete offset record for temp file
+                    # Delete offset record for temp file (single read and write)
                     temp_file_key = f"data/mpl{workstation_id}_temp.dat"
-                    if temp_file_key in offsets:
-                        del offsets[temp_file_key]
-                        
-                        # Save updated offsets
-                        with open(offset_file, 'w', encoding='utf-8') as f:
-                            json.dump(offsets, f, ensure_ascii=False, indent=2)
-                        
-                        print(f"Cleaned offset record: {temp_file_key}")
-                except Exception as e:
-                    print(f"Failed to cleanup offset records: {str(e)}")
-        
-        except Exception as e:
-            print(f"Failed to cleanup temp files: {str(e)}")
+                    with OffsetStore() as offsets:
+                        if offsets.pop(temp_file_key, None) is not None:
+                            logger.info("Cleaned offset record: %s", temp_file_key)
+                except Exception:
+                    logger.exception("Failed to cleanup offset records")
+        
+        except Exception:
+            logger.exception("Failed to cleanup temp files")
+    
+    def on_close(self):
+        """Stop the log listener and close the window"""
+        logging.getLogger().removeHandler(self.log_handler)
+        self.log_listener.stop()
+        self._executor.shutdown(wait=False)
+        self.root.destroy()
     
     def run(self):
         """Run GUI application"""
@@ -790,16 +964,24 @@ class SmartMonitorGUI:
 
 
 class LogHandler(logging.Handler):
-    """Custom log handler to send logs to GUI"""
+    """Log handler run by the QueueListener to send logs to GUI"""
     
     def __init__(self, message_queue):
         super().__init__()
         self.message_queue = message_queue
+        # Bound once; emit() is called for every log record
+        self._put = message_queue.put_nowait
+        self._dropped = 0
     
     def emit(self, record):
-        """Send log message"""
-        msg = self.format(record)
-        self.message_queue.put(msg)
+        """Send log message without blocking; drop it if the queue is full"""
+        try:
+            if self._dropped:
+                self._put(f"[{self._dropped} log messages dropped]")
+                self._dropped = 0
+            self._put(self.format(record))
+        except queue.Full:
+            self._dropped += 1
 
 
 def main():
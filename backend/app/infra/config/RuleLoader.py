@@ -7,13 +7,18 @@ from __future__ import annotations
 
 import yaml
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 from ...entities.rule import Rule, Condition, ConditionType, Operator, Severity
 
+try:
+    from yaml import CSafeLoader as _SafeLoader  # libyaml C解析器
+except ImportError:  # 未编译libyaml时退回纯Python实现
+    from yaml import SafeLoader as _SafeLoader
 
-@dataclass
+
+@dataclass(slots=True)
 class RuleConfig:
     """规则配置"""
     id: str
@@ -27,6 +32,9 @@ class RuleConfig:
 class RuleLoader:
     """规则配置加载器"""
     
+    # 绝对路径 -> (st_mtime_ns, 解析后的规则)；文件被修改后mtime变化，重新解析并替换该项
+    _cache: Dict[Path, Tuple[int, List[Rule]]] = {}
+    
     def __init__(self, config_path: str = "config/rules.yaml"):
         self.config_path = Path(config_path)
     
@@ -39,28 +47,30 @@ class RuleLoader:
         List[Rule]
             规则列表
         """
-        if not self.config_path.exists():
+        try:
+            path = self.config_path.resolve()
+            mtime_ns = self.config_path.stat().st_mtime_ns
+        except FileNotFoundError:
             return []
         
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return list(cached[1])
+        
         with open(self.config_path, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+            config_data = yaml.load(f, Loader=_SafeLoader)
         
-        rules = []
-        for rule_config in config_data.get('rules', []):
-            rule = self._parse_rule(rule_config)
-            if rule:
-                rules.append(rule)
+        rules = [rule for rule_config in config_data.get('rules', [])
+                 if (rule := self._parse_rule(rule_config)) is not None]
         
-        return rules
+        self._cache[path] = (mtime_ns, rules)
+        return list(rules)
     
     def _parse_rule(self, config: Dict) -> Optional[Rule]:
         """解析单个规则配置"""
         try:
-            conditions = []
-            for cond_config in config.get('conditions', []):
-                condition = self._parse_condition(cond_config)
-                if condition:
-                    conditions.append(condition)
+            conditions = [condition for cond_config in config.get('conditions', [])
+                          if (condition := self._parse_condition(cond_config)) is not None]
             
             if not conditions:
                 return None
@@ -84,11 +94,8 @@ class RuleLoader:
             
             if condition_type in [ConditionType.LOGIC_AND, ConditionType.LOGIC_OR]:
                 # 逻辑组合条件
-                sub_conditions = []
-                for sub_config in config.get('conditions', []):
-                    sub_condition = self._parse_condition(sub_config)
-                    if sub_condition:
-                        sub_conditions.append(sub_condition)
+                sub_conditions = [sub_condition for sub_config in config.get('conditions', [])
+                                  if (sub_condition := self._parse_condition(sub_config)) is not None]
                 
                 if not sub_conditions:
                     return None
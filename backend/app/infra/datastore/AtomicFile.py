@@ -0,0 +1,29 @@
+"""
+backend/app/infra/datastore/AtomicFile.py
+------------------------------------
+原子写文件 - 先写临时文件再替换
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    先写同目录下的临时文件，再 os.replace 覆盖目标文件
+
+    读取方只会看到旧文件或完整的新文件，崩溃时不会留下被截断的内容。
+
+    Parameters
+    ----------
+    path : Path
+        目标文件
+    data : bytes
+        要写入的内容
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
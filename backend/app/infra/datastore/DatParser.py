@@ -6,20 +6,25 @@ Incremental SigmaData .dat parser → Record objects
 作者: Xiang, Yining (GDE-CLBP)
 版本: 2025-07-07
 """
-import argparse, json, struct, datetime as dt
+import argparse, logging, mmap, os, struct, datetime as dt
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from collections import namedtuple
+from itertools import chain
 
 from ...entities.record import Record
 from .RecordRepository import RecordFactory
+from .OffsetStore import OffsetStore, OFFSET_FILE
+
+logger = logging.getLogger(__name__)
 
 # ── 常量 & 解析布局（沿用你原稿） ─────────────────────────────────────────
 BYTE_ORDER    = ">"
 RECORD_BYTES  = 232
 DAT_EPOCH     = dt.datetime(1899, 12, 30, 0, 0, 0)
 FILETIME_EPOCH = dt.datetime(1601, 1, 1, 0, 0, 0)  # 添加FILETIME_EPOCH
-OFFSET_DB     = Path(".offsets.json")
+OFFSET_DB     = OFFSET_FILE
 
 # ---- 布局表（与你原脚本一致，省略重复） -------------------------------
 # ── 布局表 ───────────────────────────────────────────────────────────
@@ -73,60 +78,78 @@ DIGITAL_MAP = {
     122:["DE1","DE2","DE3","DE4","DE5","DE6","DE7","unused2"],
     155:["DE8","DE9","DE10","DE11","DE12","DE13","DE14","unused3"],
 }
-DIGITAL_NAMES = sum(DIGITAL_MAP.values(), [])
+DIGITAL_NAMES = tuple(chain.from_iterable(DIGITAL_MAP.values()))
 
-# === 简易偏移持久化 ================================================
-def _load_offsets() -> Dict[str, int]:
-    if OFFSET_DB.exists():
-        return json.loads(OFFSET_DB.read_text())
-    return {}
+# ── 整条记录一次解包 ───────────────────────────────────────────────
+def _record_format() -> str:
+    """按 RECORD_LAYOUT 拼出整条记录的 struct 格式，字段间空隙用 x 填充"""
+    fmt, pos = BYTE_ORDER, 0
+    for _, off, f in RECORD_LAYOUT:
+        if off > pos:
+            fmt += f"{off - pos}x"
+        fmt += f
+        pos = off + struct.calcsize(BYTE_ORDER + f)
+    if RECORD_BYTES > pos:
+        fmt += f"{RECORD_BYTES - pos}x"
+    return fmt
 
-def _save_offsets(tbl: Dict[str, int]):
-    OFFSET_DB.write_text(json.dumps(tbl))
+_RECORD_STRUCT = struct.Struct(_record_format())
+assert _RECORD_STRUCT.size == RECORD_BYTES
 
-def get_offset(path: Path) -> int:
-    tbl = _load_offsets()
-    # 尝试相对路径和绝对路径
-    relative_path = str(path.relative_to(Path.cwd())) if path.is_absolute() else str(path)
+_OFFSET_INDEX = {o: i for i, (_, o, _) in enumerate(RECORD_LAYOUT)}
+# (解包结果下标, 字段名, 是否round) —— 数字量字节不直接输出，下面拆位
+_VALUE_FIELDS = tuple((i, n, f in "fd") for i, (n, _, f) in enumerate(RECORD_LAYOUT)
+                      if n not in ("DIG0", "DIG1", "DEB1", "DEB2"))
+_DIGITAL_FIELDS = tuple((_OFFSET_INDEX[off], tuple(names)) for off, names in DIGITAL_MAP.items())
+# 字节值 -> 8个位（低位在前），拆位查表代替逐位移位
+_BYTE_BITS = [tuple((v >> bit) & 1 for bit in range(8)) for v in range(256)]
+
+# === 偏移持久化（OffsetStore：读一次，有修改才写回） =================
+def _offset_keys(path: Path) -> Tuple[str, str]:
+    """(相对路径, 绝对路径)；相对路径是写入时使用的键"""
     absolute_path = str(path.absolute())
-    
-    # 优先使用相对路径
-    if relative_path in tbl:
-        return tbl[relative_path]
-    elif absolute_path in tbl:
-        return tbl[absolute_path]
-    else:
-        return 0
+    if not path.is_absolute():
+        return str(path), absolute_path
+    try:
+        return str(path.relative_to(Path.cwd())), absolute_path
+    except ValueError:  # 不在当前目录下，只能用绝对路径
+        return absolute_path, absolute_path
 
-def save_offset(path: Path, pos: int):
-    tbl = _load_offsets()
+def _get_offset(keys: Tuple[str, str]) -> int:
+    relative_path, absolute_path = keys
+    with OffsetStore(OFFSET_DB) as tbl:
+        # 优先使用相对路径
+        if relative_path in tbl:
+            return tbl[relative_path]
+        return tbl.get(absolute_path, 0)
+
+def _save_offset(keys: Tuple[str, str], pos: int):
     # 确保使用相对路径，避免绝对路径和相对路径重复
-    relative_path = str(path.relative_to(Path.cwd())) if path.is_absolute() else str(path)
-    tbl[relative_path] = pos
-    _save_offsets(tbl)
+    with OffsetStore(OFFSET_DB) as tbl:
+        tbl[keys[0]] = pos
+
+def get_offset(path: Path) -> int:
+    return _get_offset(_offset_keys(path))
+
+def save_offset(path: Path, pos: int):
+    _save_offset(_offset_keys(path), pos)
 
 # === 解析单条记录 → dict  ==========================================
-def _parse_record(buf: bytes) -> Dict[str, float]:
+def _record_from_values(values: tuple) -> Tuple[dt.datetime, Dict[str, float]]:
+    """整条记录解包后的字段元组 → (记录时间, dict)"""
     rec: Dict[str, float] = {}
-    for f in FIELDS:
-        if f.name in ("DIG0", "DIG1", "DEB1", "DEB2"):
-            continue
-        value = struct.unpack_from(f.fmt, buf, f.offset)[0]
+    for i, name, rounded in _VALUE_FIELDS:
         # 对浮点数值进行round到小数点后两位
-        if f.fmt.endswith('f') or f.fmt.endswith('d'):
-            rec[f.name] = round(value, 2)
-        else:
-            rec[f.name] = value
+        rec[name] = round(values[i], 2) if rounded else values[i]
 
-    for off, names in DIGITAL_MAP.items():
-        val = struct.unpack_from(">B", buf, off)[0]
-        for bit, name in enumerate(names):
-            rec[name] = (val >> bit) & 1
+    for i, names in _DIGITAL_FIELDS:
+        rec.update(zip(names, _BYTE_BITS[values[i]]))
 
     # 处理两个时间戳
     # Time: 秒数，从1899-12-30开始
     secs = rec["Time"]
-    rec["Time_iso"] = (DAT_EPOCH + dt.timedelta(seconds=secs)).isoformat(sep=" ")
+    time_dt = DAT_EPOCH + dt.timedelta(seconds=secs)
+    rec["Time_iso"] = time_dt.isoformat(sep=" ")
     
     # Timestamp: 高精度时间戳，从1601-01-01开始，精度100纳秒
     filetime_ticks = rec["Timestamp"]
@@ -134,22 +157,37 @@ def _parse_record(buf: bytes) -> Dict[str, float]:
     filetime_seconds = filetime_ticks * 0.0000001
     rec["Timestamp_iso"] = (FILETIME_EPOCH + dt.timedelta(seconds=filetime_seconds)).isoformat(sep=" ")
     
-    return rec
+    return time_dt, rec
 
 # === 增量迭代器 → Record ===========================================
+def _iter_tail(path: Path, start: int, run_id: str) -> Iterator[Record]:
+    """从 start 起解析文件中的完整记录（只解析，不读写偏移）"""
+    # mmap 映射文件，按记录切 memoryview，不再逐条 read/拷贝
+    pos = start
+    with path.open("rb") as fd, mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # 以映射时的实际长度为准，只取完整记录
+        end = start + max(0, len(mm) - start) // RECORD_BYTES * RECORD_BYTES
+        with memoryview(mm) as view:
+            # iter_unpack 一次遍历整段新增数据，不再逐条切片
+            for values in _RECORD_STRUCT.iter_unpack(view[start:end]):
+                # 直接把 datetime 交给 RecordFactory，省去 isoformat → fromisoformat 往返
+                time_dt, rdict = _record_from_values(values)
+                yield RecordFactory.from_dict(rdict, run_id=run_id, file_pos=pos, ts=time_dt)
+                pos += RECORD_BYTES
+
 def iter_new_records(path: Path, run_id: str):
-    start = get_offset(path)
+    # 偏移键每次扫描只计算一次（cwd / relative_to / absolute）
+    keys = _offset_keys(path)
+    start = _get_offset(keys)
     file_size = path.stat().st_size if path.exists() else 0
     
     # TODO: 我总觉得这个逻辑不太好，这部分应该放在别的地方处理
     # 检查offset是否超过文件大小，如果是则重置为0
     if start >= file_size:
         start = 0
-        save_offset(path, start)
+        _save_offset(keys, start)
     
     # 添加调试信息
-    import logging
-    logger = logging.getLogger(__name__)
     readable_bytes = max(0, file_size - start)  # 确保不为负数
     logger.info(f"DatParser: 文件={path}, 当前offset={start}, 文件大小={file_size}, 可读字节数={readable_bytes}")
     
@@ -158,21 +196,81 @@ def iter_new_records(path: Path, run_id: str):
         logger.info(f"DatParser: 没有新数据可读")
         return
     
-    with path.open("rb") as fd:
-        fd.seek(start)
-        pos = start
-        record_count = 0
-        while chunk := fd.read(RECORD_BYTES):
-            if len(chunk) == RECORD_BYTES:
-                rdict = _parse_record(chunk)
-                yield RecordFactory.from_dict(rdict, run_id=run_id, file_pos=pos)
-                pos += RECORD_BYTES
-                record_count += 1
-            else:
-                logger.info(f"DatParser: 读取到不完整的chunk，长度={len(chunk)}字节")
-        # 解析完毕，保存最新偏移
-        save_offset(path, pos)
-        logger.info(f"DatParser: 本次解析完成，读取了{record_count}条记录，新offset={pos}")
+    if readable_bytes % RECORD_BYTES:
+        logger.info(f"DatParser: 读取到不完整的chunk，长度={readable_bytes % RECORD_BYTES}字节")
+    
+    pos = start
+    record_count = 0
+    for record in _iter_tail(path, start, run_id):
+        yield record
+        pos += RECORD_BYTES
+        record_count += 1
+    # 解析完毕，保存最新偏移
+    _save_offset(keys, pos)
+    logger.info(f"DatParser: 本次解析完成，读取了{record_count}条记录，新offset={pos}")
+
+# === 多文件并行解析 ================================================
+def _parse_tail(path: Path, start: int, run_id: str) -> Tuple[List[Record], int]:
+    """子进程任务：解析新增记录，返回 (记录列表, 新偏移)"""
+    records = list(_iter_tail(path, start, run_id))
+    return records, start + len(records) * RECORD_BYTES
+
+def parse_all(paths: List[Path], run_id: Optional[str] = None,
+              max_workers: Optional[int] = None) -> Dict[Path, List[Record]]:
+    """
+    并行解析多个 .dat 文件的新增记录（每个文件一个进程任务）
+
+    偏移只在父进程读写：开始前读一次，全部解析完后一次写回，
+    子进程只负责解析，不会并发改写 .offsets.json。
+
+    Parameters
+    ----------
+    paths : List[Path]
+        .dat 文件路径
+    run_id : Optional[str]
+        记录的 run_id，默认使用各文件名（stem）
+    max_workers : Optional[int]
+        进程数，默认 min(待解析文件数, CPU核数)
+
+    Returns
+    -------
+    Dict[Path, List[Record]]
+        每个文件本次新增的记录
+    """
+    paths = [Path(p) for p in paths]
+    results: Dict[Path, List[Record]] = {p: [] for p in paths}
+
+    # (路径, 写入键, 起始偏移)
+    jobs = []
+    with OffsetStore(OFFSET_DB) as tbl:
+        for path in paths:
+            relative_path, absolute_path = _offset_keys(path)
+            start = tbl[relative_path] if relative_path in tbl else tbl.get(absolute_path, 0)
+            file_size = path.stat().st_size if path.exists() else 0
+            # 与 iter_new_records 相同：偏移超过文件大小时从头开始
+            if start >= file_size:
+                start = 0
+                tbl[relative_path] = start
+            if file_size - start >= RECORD_BYTES:
+                jobs.append((path, relative_path, start))
+
+    if not jobs:
+        return results
+
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        parsed = list(ex.map(_parse_tail,
+                             [path for path, _, _ in jobs],
+                             [start for _, _, start in jobs],
+                             [run_id or path.stem for path, _, _ in jobs],
+                             chunksize=1))
+
+    with OffsetStore(OFFSET_DB) as tbl:
+        for (path, relative_path, _), (records, end) in zip(jobs, parsed):
+            results[path] = records
+            tbl[relative_path] = end
+    logger.info(f"DatParser: 并行解析{len(jobs)}个文件，共{sum(len(r) for r in results.values())}条记录")
+    return results
 
 # === CLI ===========================================================
 def main():
@@ -0,0 +1,107 @@
+"""
+backend/app/infra/datastore/OffsetStore.py
+------------------------------------
+Offset记录存储 - .offsets.json 的批量读写
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .AtomicFile import atomic_write_bytes
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时退回标准库json
+    orjson = None
+    import json
+
+OFFSET_FILE = Path(".offsets.json")
+
+# 路径 -> (文件标识, 解析结果)；文件未变化时跳过读取和解析。
+# 写入走 os.replace，每次都会换 inode，所以 (inode, mtime, size) 足以判断变化
+_CACHE: Dict[Path, Tuple[Tuple[int, int, int], Dict[str, int]]] = {}
+
+
+def _file_id(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _loads(data: bytes) -> Dict[str, int]:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(offsets: Dict[str, int]) -> bytes:
+    # 机器读取的文件，不缩进，写出紧凑的字节
+    if orjson is not None:
+        return orjson.dumps(offsets)
+    return json.dumps(offsets, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OffsetStore:
+    """
+    Offset记录的分组写入上下文
+
+    进入时读取一次文件，期间的修改只作用于内存，退出时一次性写回；
+    多个工作站的清理可以放在同一个 with 块里，只重写一次文件。
+    没有实际修改时退出不写文件。
+
+    Examples
+    --------
+    >>> with OffsetStore() as offsets:
+    ...     offsets.pop("data/mpl1_temp.dat", None)
+    """
+
+    def __init__(self, path: Path = OFFSET_FILE):
+        self.path = Path(path)
+        self._offsets: Dict[str, int] = {}
+        self._dirty = False
+
+    def __enter__(self) -> OffsetStore:
+        self._dirty = False
+        try:
+            file_id = _file_id(self.path.stat())
+        except FileNotFoundError:
+            self._offsets = {}
+            return self
+
+        cached = _CACHE.get(self.path)
+        if cached is not None and cached[0] == file_id:
+            self._offsets = dict(cached[1])
+        else:
+            self._offsets = _loads(self.path.read_bytes())
+            _CACHE[self.path] = (file_id, dict(self._offsets))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # 出错时不写回，避免把不完整的修改落盘
+        if exc_type is None and self._dirty:
+            self._write()
+
+    def _write(self) -> None:
+        """先写临时文件再替换，崩溃时不会留下被截断的JSON"""
+        atomic_write_bytes(self.path, _dumps(self._offsets))
+        _CACHE[self.path] = (_file_id(self.path.stat()), dict(self._offsets))
+
+    def get(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        return self._offsets.get(key, default)
+
+    def pop(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        if key not in self._offsets:
+            return default
+        self._dirty = True
+        return self._offsets.pop(key)
+
+    def __getitem__(self, key: str) -> int:
+        return self._offsets[key]
+
+    def __setitem__(self, key: str, pos: int) -> None:
+        if self._offsets.get(key) != pos:
+            self._offsets[key] = pos
+            self._dirty = True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._offsets
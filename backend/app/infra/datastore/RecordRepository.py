@@ -5,16 +5,19 @@ backend/app/infra/datastore/RecordRepository.py
 """
 from ...entities.record import Record
 from datetime import datetime, timezone
+from typing import Optional
 
 class RecordFactory:
     @staticmethod
-    def from_dict(d: dict, run_id: str, file_pos: int = None) -> Record:
-        # 时间戳解析
-        try:
-            time_iso = d["Time_iso"]  # 不删除，只是获取值
-            ts = datetime.fromisoformat(str(time_iso)).astimezone(timezone.utc)
-        except KeyError:
-            raise ValueError("Expecting key 'Time_iso' in parsed dict")
+    def from_dict(d: dict, run_id: str, file_pos: int = None, ts: Optional[datetime] = None) -> Record:
+        # 时间戳解析：调用方已有 datetime 时直接传 ts（如 DatParser），否则解析 Time_iso
+        if ts is None:
+            try:
+                time_iso = d["Time_iso"]  # 不删除，只是获取值
+                ts = datetime.fromisoformat(str(time_iso))
+            except KeyError:
+                raise ValueError("Expecting key 'Time_iso' in parsed dict")
+        ts = ts.astimezone(timezone.utc)
         
         # 保留时间戳字段在metrics中，不删除
         # d.pop("Timestamp", None)  # 删除这行
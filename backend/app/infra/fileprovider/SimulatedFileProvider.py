@@ -3,6 +3,8 @@ backend/app/infra/fileprovider/SimulatedFileProvider.py
 ------------------------------------
 模拟文件提供者 - 模拟真实文件推送过程
 """
+import mmap
+import os
 import threading
 import time
 from pathlib import Path
@@ -45,6 +47,9 @@ class SimulatedFileProvider(FileProvider):
         self._current_record_index = 0
         self._record_size = 232  # 每个record大小为232字节（与DatParser一致）
         
+        # temp文件当前大小；运行期间只有本对象写入，内存中记录即可，不必每次stat
+        self._temp_size = 0
+        
         # 状态信息
         self._total_records = 0
         self._start_time: Optional[datetime] = None
@@ -58,6 +63,8 @@ class SimulatedFileProvider(FileProvider):
     
     def get_file_path(self) -> Optional[Path]:
         """获取当前可用的文件路径"""
+        if self._is_active:
+            return self.temp_file if self._temp_size > 0 else None
         if self.temp_file.exists() and self.temp_file.stat().st_size > 0:
             return self.temp_file
         return None
@@ -72,6 +79,10 @@ class SimulatedFileProvider(FileProvider):
             self.logger.warning("模拟文件提供者已经在运行")
             return True
         
+        if self._simulation_thread is not None and self._simulation_thread.is_alive():
+            self.logger.error("上一个模拟线程尚未退出，无法重新启动")
+            return False
+        
         if not self.source_file.exists():
             self.logger.error(f"源文件不存在: {self.source_file}")
             return False
@@ -79,10 +90,23 @@ class SimulatedFileProvider(FileProvider):
         # 初始化temp文件
         self._initialize_temp_file()
         
-        # 启动模拟线程
+        # 映射源文件，之后每个record直接从映射切片，不再反复open/seek/read
+        source_mm = self._map_source()
+        
+        # temp文件保持打开，每个record直接 os.write，不再每次open/close；
+        # 打开失败时线程不会启动，映射须在这里释放
+        try:
+            temp_fd = os.open(self.temp_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        except OSError:
+            if source_mm is not None:
+                source_mm.close()
+            raise
+        
+        # 启动模拟线程；映射和描述符作为参数交给线程，由该线程独占并负责释放
         self._stop_event.clear()
         self._simulation_thread = threading.Thread(
             target=self._simulation_worker,
+            args=(source_mm, temp_fd),
             daemon=True
         )
         self._simulation_thread.start()
@@ -112,6 +136,7 @@ class SimulatedFileProvider(FileProvider):
         try:
             # 清空temp文件
             self.temp_file.write_bytes(b'')
+            self._temp_size = 0
             self._current_record_index = 0
             self._total_records = 0
             self.logger.info(f"初始化temp文件: {self.temp_file}")
@@ -119,14 +144,34 @@ class SimulatedFileProvider(FileProvider):
             self.logger.error(f"初始化temp文件失败: {e}")
             raise
     
-    def _simulation_worker(self) -> None:
+    def _map_source(self) -> Optional[mmap.mmap]:
+        """只读映射源文件；空文件无法映射，视为没有record，返回None"""
+        with open(self.source_file, 'rb') as source:
+            try:
+                return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return None
+    
+    def _simulation_worker(self, source_mm: Optional[mmap.mmap], temp_fd: int) -> None:
         """模拟工作线程"""
+        source = memoryview(source_mm) if source_mm is not None else None
+        try:
+            self._run_simulation(source, temp_fd)
+        finally:
+            # 只释放本线程收到的映射和描述符；重新start后的新资源与本线程无关
+            if source is not None:
+                source.release()
+                source_mm.close()
+            os.close(temp_fd)
+    
+    def _run_simulation(self, source: Optional[memoryview], temp_fd: int) -> None:
+        """逐个推送record，直到停止或源文件读完"""
         self.logger.info("开始模拟文件推送...")
         
         while not self._stop_event.is_set():
             try:
                 # 从源文件读取下一个record
-                if self._read_and_append_record():
+                if self._read_and_append_record(source, temp_fd):
                     self._last_update_time = datetime.now()
                     self._total_records += 1
                     
@@ -148,36 +193,38 @@ class SimulatedFileProvider(FileProvider):
         
         self.logger.info("模拟推送线程结束")
     
-    def _read_and_append_record(self) -> bool:
+    def _read_and_append_record(self, source: Optional[memoryview], temp_fd: int) -> bool:
         """
         从源文件读取一个record并追加到temp文件
         
+        Parameters
+        ----------
+        source : Optional[memoryview]
+            源文件映射的视图，空文件时为None
+        temp_fd : int
+            temp文件追加写描述符
+        
         Returns
         -------
         bool
             是否成功读取并追加record
         """
         try:
-            with open(self.source_file, 'rb') as source:
-                # 计算当前record的位置
-                record_start = self._current_record_index * self._record_size
-                source.seek(record_start)
-                
-                # 读取一个record
-                record_data = source.read(self._record_size)
-                
-                if not record_data:
-                    self.logger.info(f"SimulatedFileProvider: 源文件已读完，当前index={self._current_record_index}")
-                    return False  # 没有更多数据
-                
-                # 追加到temp文件
-                with open(self.temp_file, 'ab') as temp:
-                    temp.write(record_data)
-                
-                self.logger.info(f"SimulatedFileProvider: 推送record {self._current_record_index + 1}, 大小={len(record_data)}字节, temp文件大小={self.temp_file.stat().st_size}字节")
-                self._current_record_index += 1
-                return True
+            # 计算当前record的位置，直接从映射切片（memoryview，不拷贝）
+            record_start = self._current_record_index * self._record_size
+            if source is None or record_start >= len(source):
+                self.logger.info(f"SimulatedFileProvider: 源文件已读完，当前index={self._current_record_index}")
+                return False  # 没有更多数据
+            
+            with source[record_start:record_start + self._record_size] as record_data:
+                # 追加到temp文件（O_APPEND，始终写在末尾）
+                os.write(temp_fd, record_data)
+                self._temp_size += len(record_data)
                 
+                self.logger.info(f"SimulatedFileProvider: 推送record {self._current_record_index + 1}, 大小={len(record_data)}字节, temp文件大小={self._temp_size}字节")
+            self._current_record_index += 1
+            return True
+            
         except Exception as e:
             self.logger.error(f"读取record失败: {e}")
             return False
@@ -5,11 +5,15 @@ backend/app/services/AlarmService.py
 """
 from __future__ import annotations
 
-import uuid
+import bisect
+import os
+import sys
 import logging
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Callable, Iterable, List, Optional, Dict, Set
 from dataclasses import dataclass
+from operator import attrgetter
 
 from ..entities.rule import Rule
 from ..entities.record import Record
@@ -17,7 +21,7 @@ from ..entities.AlarmEvent import AlarmEvent, AlarmStatus
 from . import IAlarmService
 
 
-@dataclass
+@dataclass(slots=True)
 class AlarmFilter:
     """告警过滤器"""
     severity: Optional[str] = None
@@ -28,6 +32,10 @@ class AlarmFilter:
     end_time: Optional[datetime] = None
 
 
+# 排序/插入用的时间键（C实现，比 lambda 取属性快）
+_TS_KEY = attrgetter('timestamp')
+
+
 class AlarmService(IAlarmService):
     """
     告警服务
@@ -38,9 +46,16 @@ class AlarmService(IAlarmService):
     
     def __init__(self):
         self.alarms: Dict[str, AlarmEvent] = {}
+        # 二级索引：字段值 -> 告警ID集合，按规则/运行/状态过滤时只遍历候选
+        self._by_rule_id: Dict[str, Set[str]] = defaultdict(set)
+        self._by_run_id: Dict[str, Set[str]] = defaultdict(set)
+        self._by_status: Dict[AlarmStatus, Set[str]] = defaultdict(set)
+        # 按时间升序维护的告警列表，list_alarms 倒序遍历即可，不必每次排序
+        self._by_time: List[AlarmEvent] = []
         self.logger = logging.getLogger(__name__)
     
-    def create_alarm(self, rule: Rule, record: Record, run_id: str) -> AlarmEvent:
+    def create_alarm(self, rule: Rule, record: Record, run_id: str,
+                     sensor_values: Optional[Dict[str, float]] = None) -> AlarmEvent:
         """
         创建告警事件
         
@@ -52,37 +67,50 @@ class AlarmService(IAlarmService):
             传感器记录
         run_id : str
             测试会话ID
+        sensor_values : Dict[str, float], optional
+            告警保存的传感器值，默认为记录的全部 metrics
             
         Returns
         -------
         AlarmEvent
             创建的告警事件
         """
+        # 规则ID/运行ID在大量告警间重复，驻留后共享同一字符串对象；非str的ID原样使用
+        rule_id = sys.intern(rule.id) if isinstance(rule.id, str) else rule.id
+        if isinstance(run_id, str):
+            run_id = sys.intern(run_id)
+        
+        # 生成唯一ID
+        alarm_id = f"ALARM_{rule_id}_{os.urandom(4).hex()}"
+        
         try:
-            # 生成唯一ID
-            alarm_id = f"ALARM_{rule.id}_{uuid.uuid4().hex[:8]}"
-            
             alarm = AlarmEvent(
                 id=alarm_id,
-                rule_id=rule.id,
+                rule_id=rule_id,
                 rule_name=rule.name,
                 severity=rule.severity,
                 timestamp=record.ts,
                 description=f"规则 '{rule.name}' 触发: {rule.description}",
-                sensor_values=record.metrics.copy(),
+                # 记录的 metrics 生成后不再修改，直接共享引用，不逐告警复制
+                sensor_values=record.metrics if sensor_values is None else sensor_values,
                 run_id=run_id,
                 file_pos=record.file_pos
             )
-            
-            # 存储告警
-            self.alarms[alarm_id] = alarm
-            self.logger.info(f"创建告警事件: {alarm_id}")
-            
-            return alarm
-            
         except Exception as e:
+            # 规则或记录缺少字段时在这里失败
             self.logger.error(f"创建告警事件失败: {e}")
             raise
+        
+        # 存储告警
+        self.alarms[alarm_id] = alarm
+        self._by_rule_id[alarm.rule_id].add(alarm_id)
+        self._by_run_id[alarm.run_id].add(alarm_id)
+        self._by_status[alarm.status].add(alarm_id)
+        # insort_left：同一时间的新告警排在旧告警之前，倒序遍历时与稳定排序结果一致
+        bisect.insort_left(self._by_time, alarm, key=_TS_KEY)
+        self.logger.info("创建告警事件: %s", alarm_id)
+        
+        return alarm
     
     def acknowledge_alarm(self, alarm_id: str, user: str) -> bool:
         """
@@ -100,22 +128,39 @@ class AlarmService(IAlarmService):
         bool
             是否成功确认
         """
-        try:
-            if alarm_id not in self.alarms:
-                self.logger.warning(f"告警不存在: {alarm_id}")
-                return False
+        return self.acknowledge_alarms((alarm_id,), user) == 1
+    
+    def acknowledge_alarms(self, alarm_ids: Iterable[str], user: str) -> int:
+        """
+        批量确认告警，整批使用同一个确认时间
+        
+        Parameters
+        ----------
+        alarm_ids : Iterable[str]
+            告警ID
+        user : str
+            确认用户
             
-            alarm = self.alarms[alarm_id]
-            alarm.status = AlarmStatus.ACKNOWLEDGED
-            alarm.acknowledged_by = user
-            alarm.acknowledged_at = datetime.now()
+        Returns
+        -------
+        int
+            成功确认的告警数（不存在的ID会被跳过）
+        """
+        now = datetime.now()
+        count = 0
+        for alarm_id in alarm_ids:
+            alarm = self.alarms.get(alarm_id)
+            if alarm is None:
+                self.logger.warning("告警不存在: %s", alarm_id)
+                continue
             
-            self.logger.info(f"告警已确认: {alarm_id} by {user}")
-            return True
+            self._set_status(alarm, AlarmStatus.ACKNOWLEDGED)
+            alarm.acknowledged_by = user
+            alarm.acknowledged_at = now
             
-        except Exception as e:
-            self.logger.error(f"确认告警失败: {e}")
-            return False
+            self.logger.info("告警已确认: %s by %s", alarm_id, user)
+            count += 1
+        return count
     
     def resolve_alarm(self, alarm_id: str, user: str) -> bool:
         """
@@ -133,22 +178,23 @@ class AlarmService(IAlarmService):
         bool
             是否成功解决
         """
-        try:
-            if alarm_id not in self.alarms:
-                self.logger.warning(f"告警不存在: {alarm_id}")
-                return False
-            
-            alarm = self.alarms[alarm_id]
-            alarm.status = AlarmStatus.RESOLVED
-            alarm.resolved_by = user
-            alarm.resolved_at = datetime.now()
-            
-            self.logger.info(f"告警已解决: {alarm_id} by {user}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"解决告警失败: {e}")
+        alarm = self.alarms.get(alarm_id)
+        if alarm is None:
+            self.logger.warning("告警不存在: %s", alarm_id)
             return False
+        
+        self._set_status(alarm, AlarmStatus.RESOLVED)
+        alarm.resolved_by = user
+        alarm.resolved_at = datetime.now()
+        
+        self.logger.info("告警已解决: %s by %s", alarm_id, user)
+        return True
+    
+    def _set_status(self, alarm: AlarmEvent, status: AlarmStatus) -> None:
+        """更新告警状态，同步状态索引"""
+        self._by_status[alarm.status].discard(alarm.id)
+        alarm.status = status
+        self._by_status[status].add(alarm.id)
     
     def get_alarm(self, alarm_id: str) -> Optional[AlarmEvent]:
         """获取告警事件"""
@@ -168,62 +214,72 @@ class AlarmService(IAlarmService):
         List[AlarmEvent]
             告警事件列表
         """
-        alarms = list(self.alarms.values())
+        if not filter_params:
+            return self._by_time[::-1]
+        
+        # 始终按时间倒序遍历，结果已有序，同一时间的告警与不过滤时顺序一致；
+        # 有可用索引时先按候选ID集合筛掉，其余条件不再逐条检查
+        alarms: Iterable[AlarmEvent] = reversed(self._by_time)
+        candidate_ids = self._candidate_ids(filter_params)
+        if candidate_ids is not None:
+            if not candidate_ids:
+                return []
+            alarms = (alarm for alarm in alarms if alarm.id in candidate_ids)
         
-        if filter_params:
-            alarms = self._filter_alarms(alarms, filter_params)
+        return self._filter_alarms(alarms, filter_params)
+    
+    def _candidate_ids(self, filter_params: AlarmFilter) -> Optional[Set[str]]:
+        """
+        用最有选择性的索引（规则ID > 运行ID > 状态）取候选告警ID，其余条件仍由 _filter_alarms 检查
         
-        return sorted(alarms, key=lambda x: x.timestamp, reverse=True)
+        没有可用索引时返回 None
+        """
+        for index, value in ((self._by_rule_id, filter_params.rule_id),
+                             (self._by_run_id, filter_params.run_id),
+                             (self._by_status, filter_params.status)):
+            if value:
+                return index.get(value, set())
+        return None
     
-    def _filter_alarms(self, alarms: List[AlarmEvent], filter_params: AlarmFilter) -> List[AlarmEvent]:
+    def _filter_alarms(self, alarms: Iterable[AlarmEvent], filter_params: AlarmFilter) -> List[AlarmEvent]:
         """过滤告警事件"""
-        filtered = []
+        # 只为设置了的条件构造判断函数，未设置的字段不再逐条检查
+        preds: List[Callable[[AlarmEvent], bool]] = []
         
-        for alarm in alarms:
-            # 严重程度过滤
-            if filter_params.severity and alarm.severity.value != filter_params.severity:
-                continue
-            
-            # 状态过滤
-            if filter_params.status and alarm.status != filter_params.status:
-                continue
-            
-            # 规则ID过滤
-            if filter_params.rule_id and alarm.rule_id != filter_params.rule_id:
-                continue
-            
-            # 运行ID过滤
-            if filter_params.run_id and alarm.run_id != filter_params.run_id:
-                continue
-            
-            # 时间范围过滤
-            if filter_params.start_time and alarm.timestamp < filter_params.start_time:
-                continue
-            
-            if filter_params.end_time and alarm.timestamp > filter_params.end_time:
-                continue
-            
-            filtered.append(alarm)
+        # 严重程度过滤
+        if filter_params.severity:
+            preds.append(lambda a, v=filter_params.severity: a.severity.value == v)
+        
+        # 状态过滤
+        if filter_params.status:
+            preds.append(lambda a, v=filter_params.status: a.status == v)
+        
+        # 规则ID过滤
+        if filter_params.rule_id:
+            preds.append(lambda a, v=filter_params.rule_id: a.rule_id == v)
+        
+        # 运行ID过滤
+        if filter_params.run_id:
+            preds.append(lambda a, v=filter_params.run_id: a.run_id == v)
         
-        return filtered
+        # 时间范围过滤
+        if filter_params.start_time:
+            preds.append(lambda a, v=filter_params.start_time: a.timestamp >= v)
+        
+        if filter_params.end_time:
+            preds.append(lambda a, v=filter_params.end_time: a.timestamp <= v)
+        
+        return [alarm for alarm in alarms if all(p(alarm) for p in preds)]
     
     def get_alarm_statistics(self) -> Dict:
         """获取告警统计信息"""
-        total = len(self.alarms)
-        by_severity = {}
-        by_status = {}
-        
-        for alarm in self.alarms.values():
-            # 按严重程度统计
-            severity = alarm.severity.value
-            by_severity[severity] = by_severity.get(severity, 0) + 1
-            
-            # 按状态统计
-            status = alarm.status.value
-            by_status[status] = by_status.get(status, 0) + 1
+        alarms = self.alarms.values()
+        # Counter 的计数循环在C层完成
+        by_severity = Counter(alarm.severity.value for alarm in alarms)
+        by_status = Counter(alarm.status.value for alarm in alarms)
         
         return {
-            'total': total,
-            'by_severity': by_severity,
-            'by_status': by_status
+            'total': len(self.alarms),
+            'by_severity': dict(by_severity),
+            'by_status': dict(by_status)
         } 
\ No newline at end of file
@@ -5,17 +5,29 @@ Channel Configuration Service - Handles hierarchical channel configuration and u
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
+import sys
 import yaml
 import logging
 
+try:
+    from yaml import CSafeLoader as _SafeLoader  # libyaml C parser
+except ImportError:  # libyaml not compiled in, fall back to pure Python
+    from yaml import SafeLoader as _SafeLoader
+
 from ..entities.ChannelConfiguration import (
     ChannelCategory, ChannelSubtype, ChannelDefinition,
     UserChannelSelection, TestSessionChannelConfig
 )
 from ..interfaces.IChannelConfigurationService import IChannelConfigurationService
 
+# resolved path -> ((st_mtime_ns, st_size), parsed YAML); a changed file replaces its entry.
+# The parsed data is only read, so instances share it.
+_YAML_CACHE: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+_VALID_CATEGORY_VALUES = frozenset(cat.value for cat in ChannelCategory)
+
 
 class ChannelConfigurationService(IChannelConfigurationService):
     """
@@ -36,6 +48,10 @@ class ChannelConfigurationService(IChannelConfigurationService):
         # Cache configuration data
         self._channel_definitions: Dict[str, ChannelDefinition] = {}
         self._categories_config: Dict[str, Dict] = {}
+        # channel_id -> ids of its available subtypes, for O(1) validation lookups
+        self._subtype_ids_by_channel: Dict[str, frozenset] = {}
+        # get_configuration_for_ui result; unchanged until the next load
+        self._ui_cache: Optional[Dict[str, Any]] = None
         self._loaded = False
     
     def load_configuration(self) -> None:
@@ -45,9 +61,20 @@ class ChannelConfigurationService(IChannelConfigurationService):
         if not self.config_path.exists():
             raise FileNotFoundError(f"Channel configuration file does not exist: {self.config_path}")
         
+        self._ui_cache = None
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f)
+            st = self.config_path.stat()
+            path = self.config_path.resolve()
+            signature = (st.st_mtime_ns, st.st_size)
+            cached = _YAML_CACHE.get(path)
+            if cached is not None and cached[0] == signature:
+                config_data = cached[1]
+            else:
+                # Hand the binary file to the loader (UTF-8 is detected) instead of
+                # decoding to str first; one large read covers the whole config
+                with open(self.config_path, 'rb', buffering=1024 * 1024) as f:
+                    config_data = yaml.load(f, Loader=_SafeLoader)
+                _YAML_CACHE[path] = (signature, config_data)
             
             self._categories_config = config_data.get('channel_categories', {})
             self._build_channel_definitions()
@@ -64,6 +91,7 @@ class ChannelConfigurationService(IChannelConfigurationService):
         Build ChannelDefinition objects based on configuration file
         """
         self._channel_definitions.clear()
+        self._subtype_ids_by_channel.clear()
         
         for category_key, category_config in self._categories_config.items():
             try:
@@ -85,11 +113,17 @@ class ChannelConfigurationService(IChannelConfigurationService):
                     )
                     subtypes.append(subtype)
                 
+                # Shared by every channel of the category; immutable so no channel can alter its siblings
+                subtypes = tuple(subtypes)
+                
                 # Use the first subtype as default
                 default_subtype_id = subtypes[0].subtype_id if subtypes else None
+                subtype_ids = frozenset(st.subtype_id for st in subtypes)
                 
                 # Create definition for each channel
                 for channel_id in channels:
+                    if isinstance(channel_id, str):
+                        channel_id = sys.intern(channel_id)
                     self._channel_definitions[channel_id] = ChannelDefinition(
                         channel_id=channel_id,
                         category=category,
@@ -98,9 +132,13 @@ class ChannelConfigurationService(IChannelConfigurationService):
                         system_description=category_config.get('category_description', {}).get('en', ''),
                         is_monitorable=True
                     )
+                    self._subtype_ids_by_channel[channel_id] = subtype_ids
                     
             except Exception as e:
-                self.logger.error(f"Failed to build channel definition for category {category_key}: {e}")
+                self.logger.error("Failed to build channel definition for category %s: %s", category_key, e)
+        
+        # Build the UI payload together with the definitions it is derived from
+        self._ui_cache = self._build_ui_payload()
     
     def get_configuration_for_ui(self) -> Dict[str, Any]:
         """
@@ -109,27 +147,39 @@ class ChannelConfigurationService(IChannelConfigurationService):
         Returns
         -------
         Dict[str, Any]
-            Configuration data structured for UI
+            Configuration data structured for UI. The same dict is returned
+            on every call until the configuration is reloaded; do not mutate it.
         """
         if not self._loaded:
             self.load_configuration()
         
+        if self._ui_cache is None:
+            # Definitions were assigned without _build_channel_definitions
+            self._ui_cache = self._build_ui_payload()
+        return self._ui_cache
+    
+    def _build_ui_payload(self) -> Dict[str, Any]:
+        """
+        Build the get_configuration_for_ui dict from the current definitions
+        """
         # Organize data by category
         categories_data = {}
+        # Channels of one category share the same available_subtypes tuple;
+        # serialize each tuple once and reuse it (keyed by tuple identity)
+        serialized_subtypes: Dict[int, List[Dict[str, Any]]] = {}
         
         for category_key, category_config in self._categories_config.items():
-            if category_key in [cat.value for cat in ChannelCategory]:
+            if category_key in _VALID_CATEGORY_VALUES:
                 category_channels = []
                 
                 # Get all channels in this category
                 for channel_id in category_config.get('channels', []):
                     if channel_id in self._channel_definitions:
                         definition = self._channel_definitions[channel_id]
-                        
-                        channel_data = {
-                            'channel_id': channel_id,
-                            'system_description': definition.system_description,
-                            'available_subtypes': [
+                        subtypes = definition.available_subtypes
+                        available_subtypes = serialized_subtypes.get(id(subtypes))
+                        if available_subtypes is None:
+                            available_subtypes = [
                                 {
                                     'subtype_id': st.subtype_id,
                                     'label': st.label,
@@ -138,8 +188,14 @@ class ChannelConfigurationService(IChannelConfigurationService):
                                     'unit': st.unit,
                                     'typical_range': st.typical_range
                                 }
-                                for st in definition.available_subtypes
-                            ],
+                                for st in subtypes
+                            ]
+                            serialized_subtypes[id(subtypes)] = available_subtypes
+                        
+                        channel_data = {
+                            'channel_id': channel_id,
+                            'system_description': definition.system_description,
+                            'available_subtypes': available_subtypes,
                             'default_subtype_id': definition.default_subtype_id
                         }
                         category_channels.append(channel_data)
@@ -205,14 +261,15 @@ class ChannelConfigurationService(IChannelConfigurationService):
                 errors.append(f"Channel {channel_id} does not exist")
                 continue
             
-            definition = self._channel_definitions[channel_id]
-            
             # Check if selected subtype exists
             selected_subtype_id = selection.get('selected_subtype_id', '')
             if selected_subtype_id:
-                subtype_exists = any(st.subtype_id == selected_subtype_id 
-                                   for st in definition.available_subtypes)
-                if not subtype_exists:
+                subtype_ids = self._subtype_ids_by_channel.get(channel_id)
+                if subtype_ids is None:
+                    # Definitions set without _build_channel_definitions: index on first use
+                    subtype_ids = frozenset(st.subtype_id for st in self._channel_definitions[channel_id].available_subtypes)
+                    self._subtype_ids_by_channel[channel_id] = subtype_ids
+                if selected_subtype_id not in subtype_ids:
                     errors.append(f"Subtype {selected_subtype_id} does not exist for channel {channel_id}")
         
         return errors
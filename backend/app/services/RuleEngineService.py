@@ -5,10 +5,13 @@ backend/app/services/RuleEngineService.py
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from itertools import pairwise
 import logging
+import operator
 
 from ..entities.rule import Rule, Condition, ConditionType, Operator, Severity
 from ..entities.AlarmEvent import AlarmEvent
@@ -17,6 +20,44 @@ from . import IRuleEngine
 from .AlarmService import AlarmService
 
 
+# 阈值比较：操作符 -> 比较函数，替代逐条 if/elif 判断
+# 等于/不等于按 0.001 容差比较；其他操作符（unchanged/changed）不适用于阈值条件
+_THRESHOLD_OPS: Dict[Operator, Callable[[float, float], bool]] = {
+    Operator.GREATER_THAN: operator.gt,
+    Operator.LESS_THAN: operator.lt,
+    Operator.GREATER_THAN_OR_EQUAL_TO: operator.ge,
+    Operator.LESS_THAN_OR_EQUAL_TO: operator.le,
+    Operator.EQUAL: lambda a, b: abs(a - b) < 0.001,
+    Operator.NOT_EQUAL: lambda a, b: abs(a - b) >= 0.001,
+}
+
+
+# 每个传感器保留的历史点数
+SENSOR_HISTORY_SIZE = 1000
+# 每个传感器最多记录的状态值个数，超出后淘汰最早出现的状态
+STATE_DURATION_MAX_KEYS = 10000
+
+
+@dataclass(slots=True)
+class _SensorHistory:
+    """单个传感器的历史数据：值与时间分两个定长队列存放，不再每点一个dict"""
+    values: deque = field(default_factory=lambda: deque(maxlen=SENSOR_HISTORY_SIZE))
+    timestamps: deque = field(default_factory=lambda: deque(maxlen=SENSOR_HISTORY_SIZE))
+
+
+def _rule_sensors(rule: Rule) -> Tuple[str, ...]:
+    """规则条件（含逻辑组合的子条件）引用的全部传感器，按条件中出现的顺序"""
+    sensors: Dict[str, None] = {}
+    pending = list(reversed(rule.conditions))
+    while pending:
+        condition = pending.pop()
+        if condition.type in (ConditionType.LOGIC_AND, ConditionType.LOGIC_OR):
+            pending.extend(reversed(condition.conditions or ()))
+        elif condition.sensor:
+            sensors[condition.sensor] = None
+    return tuple(sensors)
+
+
 class RuleEngine(IRuleEngine):
     """
     规则引擎
@@ -27,14 +68,36 @@ class RuleEngine(IRuleEngine):
     
     def __init__(self, alarm_service: Optional[AlarmService] = None):
         self.rules: List[Rule] = []
-        self.sensor_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
-        self.state_duration: Dict[str, Dict[str, datetime]] = defaultdict(dict)
+        # 传感器 -> 引用该传感器的规则下标；不引用任何传感器的规则每条记录都评估
+        self._rules_by_sensor: Dict[str, List[int]] = {}
+        self._always_rules: List[int] = []
+        # 所有被引用的传感器；记录包含全部这些传感器时直接按加载顺序评估，不查索引
+        self._indexed_sensors: frozenset = frozenset()
+        self._rule_order: range = range(0)
+        # 与 self.rules 对齐：每条规则引用的传感器
+        self._rule_sensors: List[Tuple[str, ...]] = []
+        self.sensor_history: Dict[str, _SensorHistory] = defaultdict(_SensorHistory)
+        # 传感器 -> {状态值: 首次出现时间}
+        self.state_duration: Dict[str, Dict[float, datetime]] = defaultdict(dict)
         self.alarm_service = alarm_service or AlarmService()
         self.logger = logging.getLogger(__name__)
     
     def load_rules(self, rules: List[Rule]) -> None:
         """加载规则"""
         self.rules = [rule for rule in rules if rule.enabled]
+        
+        self._rules_by_sensor = defaultdict(list)
+        self._always_rules = []
+        self._rule_sensors = [_rule_sensors(rule) for rule in self.rules]
+        for index, sensors in enumerate(self._rule_sensors):
+            if not sensors:
+                self._always_rules.append(index)
+            for sensor in sensors:
+                self._rules_by_sensor[sensor].append(index)
+        self._rules_by_sensor = dict(self._rules_by_sensor)
+        self._indexed_sensors = frozenset(self._rules_by_sensor)
+        self._rule_order = range(len(self.rules))
+        
         self.logger.info(f"加载了 {len(self.rules)} 条规则")
     
     def evaluate_record(self, record: Record, run_id: str) -> List[AlarmEvent]:
@@ -56,11 +119,24 @@ class RuleEngine(IRuleEngine):
         # 更新传感器历史数据
         self._update_sensor_history(record)
         
-        # 评估所有规则
+        # 记录通常包含全部通道，此时所有规则都要评估，直接用预先算好的加载顺序；
+        # 只有缺少部分传感器时才查索引，跳过条件涉及的传感器全都缺失的规则
+        # （这类规则不可能触发，且缺失传感器的条件不记录任何状态，跳过不改变结果）
+        metrics = record.metrics
+        if metrics.keys() >= self._indexed_sensors:
+            order = self._rule_order
+        else:
+            candidates = set(self._always_rules)
+            for sensor, indexes in self._rules_by_sensor.items():
+                if sensor in metrics:
+                    candidates.update(indexes)
+            order = sorted(candidates)
+        
         alarms = []
-        for rule in self.rules:
+        for index in order:
+            rule = self.rules[index]
             if self._evaluate_rule(rule, record):
-                alarm = self._create_alarm_event(rule, record, run_id)
+                alarm = self._create_alarm_event(rule, record, run_id, self._rule_sensors[index])
                 if alarm:
                     alarms.append(alarm)
         
@@ -68,11 +144,11 @@ class RuleEngine(IRuleEngine):
     
     def _update_sensor_history(self, record: Record):
         """更新传感器历史数据"""
+        ts = record.ts
         for sensor, value in record.metrics.items():
-            self.sensor_history[sensor].append({
-                'value': value,
-                'timestamp': record.ts
-            })
+            history = self.sensor_history[sensor]
+            history.values.append(value)
+            history.timestamps.append(ts)
     
     def _evaluate_rule(self, rule: Rule, record: Record) -> bool:
         """评估单个规则"""
@@ -108,29 +184,16 @@ class RuleEngine(IRuleEngine):
     
     def _evaluate_threshold(self, condition: Condition, record: Record) -> bool:
         """评估阈值条件"""
-        if condition.sensor not in record.metrics:
-            return False
-        
-        current_value = record.metrics[condition.sensor]
+        current_value = record.metrics.get(condition.sensor)
         threshold_value = condition.value
         
-        if threshold_value is None:
+        if current_value is None or threshold_value is None:
             return False
         
-        if condition.operator == Operator.GREATER_THAN:
-            return current_value > threshold_value
-        elif condition.operator == Operator.LESS_THAN:
-            return current_value < threshold_value
-        elif condition.operator == Operator.GREATER_THAN_OR_EQUAL_TO:
-            return current_value >= threshold_value
-        elif condition.operator == Operator.LESS_THAN_OR_EQUAL_TO:
-            return current_value <= threshold_value
-        elif condition.operator == Operator.EQUAL:
-            return abs(current_value - threshold_value) < 0.001
-        elif condition.operator == Operator.NOT_EQUAL:
-            return abs(current_value - threshold_value) >= 0.001
-        else:
+        compare = _THRESHOLD_OPS.get(condition.operator)
+        if compare is None:
             return False
+        return compare(current_value, threshold_value)
     
     def _evaluate_state_duration(self, condition: Condition, record: Record) -> bool:
         """评估状态持续时间条件"""
@@ -143,15 +206,18 @@ class RuleEngine(IRuleEngine):
         if duration_minutes is None:
             return False
         
-        # 检查状态是否持续指定时间
-        sensor_key = f"{condition.sensor}_{current_value}"
+        # 检查状态是否持续指定时间（外层已按传感器区分，直接以状态值为键）
+        states = self.state_duration[condition.sensor]
         now = record.ts
         
-        if sensor_key not in self.state_duration[condition.sensor]:
-            self.state_duration[condition.sensor][sensor_key] = now
+        start_time = states.get(current_value)
+        if start_time is None:
+            if len(states) >= STATE_DURATION_MAX_KEYS:
+                # 连续值传感器的状态数不设上限会一直增长，按出现顺序淘汰最早的
+                del states[next(iter(states))]
+            states[current_value] = now
             return False
         
-        start_time = self.state_duration[condition.sensor][sensor_key]
         duration = now - start_time
         
         return duration >= timedelta(minutes=duration_minutes)
@@ -162,15 +228,12 @@ class RuleEngine(IRuleEngine):
             return False
         
         # 获取历史数据
-        history = self.sensor_history[condition.sensor]
-        if len(history) < 2:
+        values = self.sensor_history[condition.sensor].values
+        if len(values) < 2:
             return False
         
         # 计算频率（简化实现：检查值变化次数）
-        changes = 0
-        for i in range(1, len(history)):
-            if abs(history[i]['value'] - history[i-1]['value']) > 0.1:
-                changes += 1
+        changes = sum(abs(cur - prev) > 0.1 for prev, cur in pairwise(values))
         
         # 如果变化次数超过阈值，认为频率异常
         return changes >= (condition.value or 5)
@@ -195,11 +258,16 @@ class RuleEngine(IRuleEngine):
                 return True
         return False
     
-    def _create_alarm_event(self, rule: Rule, record: Record, run_id: str) -> Optional[AlarmEvent]:
-        """创建告警事件"""
+    def _create_alarm_event(self, rule: Rule, record: Record, run_id: str,
+                            sensors: Tuple[str, ...] = ()) -> Optional[AlarmEvent]:
+        """创建告警事件；告警只保存规则引用的传感器值（规则未引用传感器时保存全部）"""
         try:
+            sensor_values = None
+            if sensors:
+                metrics = record.metrics
+                sensor_values = {s: metrics[s] for s in sensors if s in metrics}
             # 使用AlarmService创建告警
-            return self.alarm_service.create_alarm(rule, record, run_id)
+            return self.alarm_service.create_alarm(rule, record, run_id, sensor_values=sensor_values)
         except Exception as e:
             self.logger.error(f"创建告警事件时出错: {e}")
             return None 
\ No newline at end of file
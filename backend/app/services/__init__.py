@@ -4,7 +4,7 @@ backend/app/services/__init__.py
 服务层接口定义
 """
 from abc import ABC, abstractmethod
-from typing import List, Protocol
+from typing import Dict, List, Optional, Protocol
 from ..entities.rule import Rule
 from ..entities.record import Record
 from ..entities.AlarmEvent import AlarmEvent
@@ -25,8 +25,9 @@ class IRuleEngine(Protocol):
 class IAlarmService(Protocol):
     """告警服务接口"""
     
-    def create_alarm(self, rule: Rule, record: Record, run_id: str) -> AlarmEvent:
-        """创建告警事件"""
+    def create_alarm(self, rule: Rule, record: Record, run_id: str,
+                     sensor_values: Optional[Dict[str, float]] = None) -> AlarmEvent:
+        """创建告警事件；sensor_values 为告警保存的传感器值，默认为记录的全部 metrics"""
         ...
     
     def acknowledge_alarm(self, alarm_id: str, user: str) -> bool:
@@ -186,7 +186,6 @@ class MonitorService(IMonitorService):
         records_count = 0
         
         try:
-            from pathlib import Path
             for record in iter_new_records(Path(file_path), run_id):
                 record_alarms = self.process_record(record, run_id)
                 alarms.extend(record_alarms)
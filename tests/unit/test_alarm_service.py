@@ -0,0 +1,110 @@
+"""
+tests/unit/test_alarm_service.py
+------------------------------------
+AlarmService 单元测试
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from datetime import datetime, timedelta, timezone
+
+from backend.app.entities.AlarmEvent import AlarmStatus
+from backend.app.entities.record import Record
+from backend.app.entities.rule import Rule, Severity
+from backend.app.services.AlarmService import AlarmService, AlarmFilter
+
+T0 = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+
+def _rule(rule_id, severity=Severity.HIGH):
+    return Rule(id=rule_id, name=rule_id, description="", conditions=[], severity=severity)
+
+
+def _record(run_id, minutes):
+    return Record(run_id=run_id, ts=T0 + timedelta(minutes=minutes), metrics={"T1": 1.0})
+
+
+class TestAlarmService:
+    """AlarmService 测试类"""
+
+    def _service(self):
+        service = AlarmService()
+        service.create_alarm(_rule("r1"), _record("run1", 0), "run1")
+        service.create_alarm(_rule("r2", Severity.LOW), _record("run1", 1), "run1")
+        service.create_alarm(_rule("r1"), _record("run2", 2), "run2")
+        return service
+
+    def test_list_sorted_newest_first(self):
+        """不带过滤条件时按时间倒序返回全部告警"""
+        service = self._service()
+        alarms = service.list_alarms()
+        assert [a.timestamp for a in alarms] == sorted((a.timestamp for a in alarms), reverse=True)
+        assert len(alarms) == 3
+
+    def test_filters_use_indexes(self):
+        """按规则/运行/状态过滤结果与逐条检查一致"""
+        service = self._service()
+        assert {a.run_id for a in service.list_alarms(AlarmFilter(rule_id="r1"))} == {"run1", "run2"}
+        assert [a.rule_id for a in service.list_alarms(AlarmFilter(run_id="run1"))] == ["r2", "r1"]
+        assert [a.rule_id for a in service.list_alarms(AlarmFilter(rule_id="r1", run_id="run2"))] == ["r1"]
+        assert [a.rule_id for a in service.list_alarms(AlarmFilter(run_id="run1", severity="low"))] == ["r2"]
+        assert service.list_alarms(AlarmFilter(rule_id="missing")) == []
+
+    def test_status_index_follows_updates(self):
+        """确认/解决后状态过滤随之变化"""
+        service = self._service()
+        first, second, third = service.list_alarms()
+        assert service.acknowledge_alarm(first.id, "op")
+        assert service.resolve_alarm(second.id, "op")
+        assert not service.acknowledge_alarm("missing", "op")
+
+        assert service.list_alarms(AlarmFilter(status=AlarmStatus.ACTIVE)) == [third]
+        assert service.list_alarms(AlarmFilter(status=AlarmStatus.ACKNOWLEDGED)) == [first]
+        assert service.list_alarms(AlarmFilter(status=AlarmStatus.RESOLVED)) == [second]
+        assert service.get_alarm_statistics()["by_status"] == {"active": 1, "acknowledged": 1, "resolved": 1}
+
+    def test_out_of_order_alarms_listed_by_time(self):
+        """乱序到达的告警仍按时间倒序返回（含无索引的过滤）"""
+        service = self._service()
+        late = service.create_alarm(_rule("r3", Severity.LOW), _record("run3", -5), "run3")
+
+        assert service.list_alarms()[-1] is late
+        low = service.list_alarms(AlarmFilter(severity="low"))
+        assert [a.rule_id for a in low] == ["r2", "r3"]
+        window = AlarmFilter(start_time=T0, end_time=T0 + timedelta(minutes=1))
+        assert [a.rule_id for a in service.list_alarms(window)] == ["r2", "r1"]
+
+    def test_acknowledge_alarms_bulk(self):
+        """批量确认共用同一时间，跳过不存在的ID"""
+        service = self._service()
+        ids = [a.id for a in service.list_alarms(AlarmFilter(rule_id="r1"))]
+
+        assert service.acknowledge_alarms(ids + ["missing"], "op") == 2
+        acked = service.list_alarms(AlarmFilter(status=AlarmStatus.ACKNOWLEDGED))
+        assert sorted(a.id for a in acked) == sorted(ids)
+        assert len({a.acknowledged_at for a in acked}) == 1
+        assert all(a.acknowledged_by == "op" for a in acked)
+
+    def test_non_str_rule_id(self):
+        """规则ID不是str时仍然创建告警"""
+        service = AlarmService()
+        alarm = service.create_alarm(_rule(101), _record("run1", 0), "run1")
+
+        assert alarm.rule_id == 101
+        assert alarm.id.startswith("ALARM_101_")
+        assert service.list_alarms(AlarmFilter(rule_id=101)) == [alarm]
+
+    def test_equal_timestamps_keep_order(self):
+        """同一时间的告警，过滤与不过滤时顺序一致"""
+        service = AlarmService()
+        for n in range(6):
+            service.create_alarm(_rule(f"r{n % 2}"), _record("run", 0), "run")
+        all_ids = [a.id for a in service.list_alarms()]
+        service.acknowledge_alarm(all_ids[3], "op")
+        service.acknowledge_alarm(all_ids[1], "op")
+
+        assert [a.id for a in service.list_alarms(AlarmFilter(run_id="run"))] == all_ids
+        assert [a.id for a in service.list_alarms(AlarmFilter(rule_id="r0"))] == all_ids[0::2]
+        assert [a.id for a in service.list_alarms(AlarmFilter(status=AlarmStatus.ACTIVE))] == \
+            [i for i in all_ids if i not in (all_ids[1], all_ids[3])]
@@ -0,0 +1,65 @@
+"""
+tests/unit/test_dat_parser.py
+------------------------------------
+DatParser 单元测试
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import struct
+from datetime import datetime, timezone
+
+from backend.app.infra.datastore import DatParser
+from backend.app.infra.datastore.DatParser import RECORD_BYTES
+
+
+def _write_records(path, count):
+    """写入 count 条时间递增的合成记录"""
+    with path.open("wb") as f:
+        for i in range(count):
+            buf = bytearray(RECORD_BYTES)
+            # Time 字段（OLE 日期，单位：天），其余字段保持为 0
+            struct.pack_into(">d", buf, 0, 45000.0 + i / 86400)
+            f.write(bytes(buf))
+
+
+class TestParseAll:
+    """parse_all 测试类"""
+
+    def test_matches_sequential_parse(self, tmp_path, monkeypatch):
+        """并行解析结果与逐个 iter_new_records 一致，偏移一次写回"""
+        monkeypatch.setattr(DatParser, "OFFSET_DB", tmp_path / ".offsets.json")
+        monkeypatch.chdir(tmp_path)
+        a, b, empty = tmp_path / "a.dat", tmp_path / "b.dat", tmp_path / "empty.dat"
+        _write_records(a, 3)
+        _write_records(b, 5)
+        empty.write_bytes(b"")
+
+        results = DatParser.parse_all([a, b, empty], max_workers=2)
+
+        assert [len(results[p]) for p in (a, b, empty)] == [3, 5, 0]
+        assert DatParser.get_offset(a) == 3 * RECORD_BYTES
+        assert DatParser.get_offset(b) == 5 * RECORD_BYTES
+
+        monkeypatch.setattr(DatParser, "OFFSET_DB", tmp_path / "seq.json")
+        sequential = list(DatParser.iter_new_records(b, run_id="b"))
+        assert results[b] == sequential
+
+
+class TestIterNewRecords:
+    """iter_new_records 测试类"""
+
+    def test_ts_not_in_metrics(self, tmp_path, monkeypatch):
+        """记录时间直接交给 Record.ts，metrics 只含解析出的字段"""
+        monkeypatch.setattr(DatParser, "OFFSET_DB", tmp_path / ".offsets.json")
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "a.dat"
+        _write_records(path, 2)
+
+        records = list(DatParser.iter_new_records(path, run_id="a"))
+
+        assert len(records) == 2
+        for record in records:
+            assert "_ts" not in record.metrics
+            assert record.ts == datetime.fromisoformat(record.metrics["Time_iso"]).astimezone(timezone.utc)
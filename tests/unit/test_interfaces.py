@@ -104,7 +104,7 @@ class TestIChannelConfigurationService(unittest.TestCase):
         self.assertIsInstance(self.channel_service, IChannelConfigurationService)
     
     @patch('builtins.open', create=True)
-    @patch('yaml.safe_load')
+    @patch('yaml.load')
     def test_load_configuration(self, mock_yaml_load, mock_open):
         """Test load_configuration method"""
         # Mock YAML data
@@ -0,0 +1,89 @@
+"""
+tests/unit/test_offset_store.py
+------------------------------------
+OffsetStore 单元测试
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import json
+from unittest.mock import patch
+
+from backend.app.infra.datastore.OffsetStore import OffsetStore
+
+
+class TestOffsetStore:
+    """OffsetStore 测试类"""
+
+    def test_missing_file_starts_empty(self, tmp_path):
+        """文件不存在时为空，退出后写出文件"""
+        path = tmp_path / ".offsets.json"
+        with OffsetStore(path) as offsets:
+            assert "data/a.dat" not in offsets
+            offsets["data/a.dat"] = 232
+
+        assert json.loads(path.read_text()) == {"data/a.dat": 232}
+
+    def test_grouped_mutations_written_once(self, tmp_path):
+        """多次修改在退出时一次写回"""
+        path = tmp_path / ".offsets.json"
+        path.write_text(json.dumps({"a": 1, "b": 2, "c": 3}))
+
+        with OffsetStore(path) as offsets:
+            assert offsets.pop("a") == 1
+            assert offsets.pop("missing", None) is None
+            offsets["c"] = 464
+            # 退出前文件保持原样
+            assert json.loads(path.read_text()) == {"a": 1, "b": 2, "c": 3}
+
+        assert json.loads(path.read_text()) == {"b": 2, "c": 464}
+        assert not (tmp_path / ".offsets.json.tmp").exists()
+
+    def test_unchanged_offsets_not_rewritten(self, tmp_path):
+        """没有实际修改时不重写文件"""
+        path = tmp_path / ".offsets.json"
+        path.write_text(json.dumps({"a": 1}))
+        mtime = path.stat().st_mtime_ns
+
+        with OffsetStore(path) as offsets:
+            assert offsets.pop("missing", None) is None
+            offsets["a"] = 1
+
+        assert path.stat().st_mtime_ns == mtime
+
+        with OffsetStore(tmp_path / "absent.json"):
+            pass
+        assert not (tmp_path / "absent.json").exists()
+
+    def test_exception_discards_changes(self, tmp_path):
+        """with 块内出错时不写回"""
+        path = tmp_path / ".offsets.json"
+        path.write_text(json.dumps({"a": 1}))
+
+        try:
+            with OffsetStore(path) as offsets:
+                offsets.pop("a")
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+        assert json.loads(path.read_text()) == {"a": 1}
+
+    def test_unchanged_file_not_reparsed(self, tmp_path):
+        """文件未变化时复用缓存，外部修改后重新读取"""
+        path = tmp_path / ".offsets.json"
+        with OffsetStore(path) as offsets:
+            offsets["a"] = 1
+
+        with patch("backend.app.infra.datastore.OffsetStore._loads") as loads:
+            with OffsetStore(path) as offsets:
+                assert offsets["a"] == 1
+            loads.assert_not_called()
+
+        # 其他进程改写文件（新inode）后读到新内容
+        tmp = tmp_path / "other.json"
+        tmp.write_text(json.dumps({"a": 2}))
+        os.replace(tmp, path)
+        with OffsetStore(path) as offsets:
+            assert offsets["a"] == 2
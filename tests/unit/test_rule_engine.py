@@ -334,6 +334,102 @@ class TestRuleEngine:
         assert alarms3[0].rule_id == "complex_test"
 
 
+    def test_frequency_condition(self):
+        """测试频率条件（值变化次数）"""
+        # 创建规则：压力变化（>0.1）达到3次
+        rule = Rule(
+            id="pressure_frequency_test",
+            name="压力频率测试",
+            description="压力频繁波动",
+            conditions=[
+                Condition(
+                    type=ConditionType.FREQUENCY,
+                    sensor="压力",
+                    operator=Operator.CHANGED,
+                    value=3
+                )
+            ],
+            severity=Severity.LOW
+        )
+        
+        self.rule_engine.load_rules([rule])
+        
+        base_time = datetime.now()
+        triggered = []
+        # 0.05 的变化不计入，之后每次变化 0.5
+        for i, value in enumerate([1.0, 1.05, 1.5, 1.0, 1.5]):
+            record = Record(
+                run_id=self.run_id,
+                ts=base_time + timedelta(seconds=i),
+                metrics={"压力": value}
+            )
+            triggered.append(len(self.rule_engine.evaluate_record(record, self.run_id)))
+        
+        assert triggered == [0, 0, 0, 0, 1]
+
+    def test_rules_indexed_by_sensor(self):
+        """只评估涉及本记录传感器的规则，告警顺序与规则加载顺序一致"""
+        def threshold_rule(rule_id, sensor):
+            return Rule(
+                id=rule_id,
+                name=rule_id,
+                description="",
+                conditions=[
+                    Condition(
+                        type=ConditionType.THRESHOLD,
+                        sensor=sensor,
+                        operator=Operator.GREATER_THAN,
+                        value=0.0
+                    )
+                ],
+                severity=Severity.LOW
+            )
+        
+        either = Rule(
+            id="either",
+            name="either",
+            description="",
+            conditions=[
+                Condition(
+                    type=ConditionType.LOGIC_OR,
+                    sensor="",
+                    operator=Operator.GREATER_THAN,
+                    conditions=[
+                        threshold_rule("_", "压力").conditions[0],
+                        threshold_rule("_", "湿度").conditions[0],
+                    ]
+                )
+            ],
+            severity=Severity.LOW
+        )
+        
+        self.rule_engine.load_rules([
+            threshold_rule("humidity", "湿度"),
+            either,
+            threshold_rule("temperature", "温度"),
+            threshold_rule("pressure", "压力"),
+        ])
+        
+        record = Record(
+            run_id=self.run_id,
+            ts=datetime.now(),
+            metrics={"压力": 1.0, "温度": 1.0}
+        )
+        alarms = self.rule_engine.evaluate_record(record, self.run_id)
+        assert [a.rule_id for a in alarms] == ["either", "temperature", "pressure"]
+        # 告警只保存规则引用的传感器值
+        assert alarms[0].sensor_values == {"压力": 1.0}
+        assert alarms[1].sensor_values == {"温度": 1.0}
+
+        # 包含全部传感器的记录按加载顺序评估所有规则
+        record = Record(
+            run_id=self.run_id,
+            ts=datetime.now(),
+            metrics={"压力": 1.0, "温度": 1.0, "湿度": 1.0}
+        )
+        alarms = self.rule_engine.evaluate_record(record, self.run_id)
+        assert [a.rule_id for a in alarms] == ["humidity", "either", "temperature", "pressure"]
+
 if __name__ == "__main__":
     # 运行测试
     test = TestRuleEngine()
@@ -0,0 +1,63 @@
+"""
+tests/unit/test_rule_loader.py
+------------------------------------
+RuleLoader 单元测试
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from unittest.mock import patch
+
+from backend.app.infra.config.RuleLoader import RuleLoader
+
+RULES_YAML = """
+rules:
+  - id: "temp_high"
+    name: "温度过高告警"
+    severity: "high"
+    conditions:
+      - type: "threshold"
+        sensor: "温度"
+        operator: ">"
+        value: 8.0
+"""
+
+
+class TestRuleLoader:
+    """RuleLoader 测试类"""
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        """配置文件不存在时返回空列表"""
+        assert RuleLoader(str(tmp_path / "missing.yaml")).load_rules() == []
+
+    def test_unchanged_file_parsed_once(self, tmp_path):
+        """文件未修改时重复加载不再解析YAML"""
+        path = tmp_path / "rules.yaml"
+        path.write_text(RULES_YAML, encoding="utf-8")
+
+        with patch("backend.app.infra.config.RuleLoader.yaml.load",
+                   wraps=__import__("yaml").load) as yaml_load:
+            first = RuleLoader(str(path)).load_rules()
+            second = RuleLoader(str(path)).load_rules()
+
+        assert yaml_load.call_count == 1
+        assert [r.id for r in first] == ["temp_high"]
+        # 返回副本，调用方修改列表不影响缓存
+        assert first is not second
+        first.clear()
+        assert len(RuleLoader(str(path)).load_rules()) == 1
+
+    def test_modified_file_reloaded(self, tmp_path):
+        """mtime变化后重新解析"""
+        path = tmp_path / "rules.yaml"
+        path.write_text(RULES_YAML, encoding="utf-8")
+        assert len(RuleLoader(str(path)).load_rules()) == 1
+
+        path.write_text(RULES_YAML.replace("temp_high", "temp_very_high"), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert [r.id for r in RuleLoader(str(path)).load_rules()] == ["temp_very_high"]
+        # 按路径缓存，文件修改后替换原有项，不会累积旧版本
+        assert RuleLoader._cache[path.resolve()][0] == path.stat().st_mtime_ns
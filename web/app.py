@@ -9,6 +9,13 @@ import os
 import sys
 import traceback
 
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader  # libyaml C解析器
+except ImportError:  # 未编译libyaml时退回纯Python SafeLoader
+    from yaml import SafeLoader as _SafeLoader
+
 # 添加backend路径到Python路径
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
@@ -705,7 +712,6 @@ def get_rules_config():
         return jsonify({'error': 'Web adapter not available'}), 500
     
     try:
-        import yaml
         from pathlib import Path
         
         config_path = Path("config/rules.yaml")
@@ -716,7 +722,7 @@ def get_rules_config():
             })
         
         with open(config_path, 'r', encoding='utf-8') as f:
-            rules = yaml.safe_load(f)
+            rules = yaml.load(f, Loader=_SafeLoader)
         
         return jsonify({
             'success': True,
@@ -732,7 +738,6 @@ def get_channels_config():
         return jsonify({'error': 'Web adapter not available'}), 500
     
     try:
-        import yaml
         from pathlib import Path
         
         config_path = Path("config/channel_definitions.yaml")
@@ -743,7 +748,7 @@ def get_channels_config():
             })
         
         with open(config_path, 'r', encoding='utf-8') as f:
-            channels = yaml.safe_load(f)
+            channels = yaml.load(f, Loader=_SafeLoader)
         
         return jsonify({
             'success': True,